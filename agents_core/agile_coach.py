@@ -2,12 +2,25 @@
 
 from __future__ import annotations
 
+import contextlib
 from dataclasses import dataclass
 
-from memory.long_term import KnowledgeGraph
+from memory.long_term import enqueue_note
 
 from .base import BaseAgent
 
+_ACCEPTANCE_HINT = "Definiere messbare Akzeptanzkriterien."
+_EXPERTS_HINT = "Beziehe die richtigen Expert:innen frühzeitig ein."
+_SLICING_HINT = "Schneide Arbeit in kleine, testbare Inkremente."
+
+# Plan feedback keyed by (has acceptance criteria, mentions experts); only four outcomes exist
+_PLAN_ADVICE: dict[tuple[bool, bool], str] = {
+    (False, False): " ".join((_ACCEPTANCE_HINT, _EXPERTS_HINT, _SLICING_HINT)),
+    (False, True): " ".join((_ACCEPTANCE_HINT, _SLICING_HINT)),
+    (True, False): " ".join((_EXPERTS_HINT, _SLICING_HINT)),
+    (True, True): _SLICING_HINT,
+}
+
 
 @dataclass(slots=True)
 class AgileCoachAgent(BaseAgent):
@@ -29,20 +42,12 @@ class AgileCoachAgent(BaseAgent):
         if not tasks:
             advice = "Bitte formuliere mindestens eine umsetzbare Aufgabe."
         else:
-            actionable = any("acceptance" in t.lower() or "akzeptanz" in t.lower() for t in tasks)
-            experts = any("expert" in t.lower() or "experte" in t.lower() for t in tasks)
-            suggestions: list[str] = []
-            if not actionable:
-                suggestions.append("Definiere messbare Akzeptanzkriterien.")
-            if not experts:
-                suggestions.append("Beziehe die richtigen Expert:innen frühzeitig ein.")
-            suggestions.append("Schneide Arbeit in kleine, testbare Inkremente.")
-            advice = " ".join(suggestions)
+            lowered = [t.lower() for t in tasks]
+            actionable = any("acceptance" in t or "akzeptanz" in t for t in lowered)
+            experts = any("expert" in t for t in lowered)  # also covers "experte"
+            advice = _PLAN_ADVICE[actionable, experts]
         self.observe(f"ac_feedback: {advice}")
-        # Store a brief feedback note in long-term memory (no-op if Neo4j not configured)
-        try:
-            kg = KnowledgeGraph()
-            kg.upsert_note(self.name, f"feedback: {advice}")
-        except Exception:  # pragma: no cover - defensive  # pylint: disable=broad-exception-caught
-            pass
+        # Queue a brief feedback note for long-term memory (no-op if Neo4j not configured)
+        with contextlib.suppress(Exception):  # pragma: no cover - defensive
+            enqueue_note(self.name, f"feedback: {advice}")
         return advice
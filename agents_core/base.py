@@ -2,10 +2,20 @@
 
 from __future__ import annotations
 
+import asyncio
+import os
 from dataclasses import dataclass
 from typing import Protocol
 
-from .llm import LLM, detect_llm
+from .cache import LRUCache
+from .llm import LLM, _env_truthy, detect_llm, generate_chat, provider_key
+
+# LLM thoughts keyed by (role, whitespace-normalized goal, provider key). Opt-in with
+# AGENT_THINK_CACHE=1: providers sample, so a cached thought replays one answer for every
+# repeat of a goal.
+_THOUGHT_CACHE: LRUCache[tuple[str, str, str | None], str] = LRUCache(
+    maxsize=512, ttl=float(os.getenv("AGENT_THINK_CACHE_TTL", "300"))
+)
 
 
 class Memory(Protocol):
@@ -40,6 +50,11 @@ class BaseAgent:
         if self.memory:
             self.memory.append(self.name, content)
 
+    async def aobserve(self, content: str) -> None:
+        """Like observe(), but runs the (possibly Redis-backed) write off the event loop."""
+        if self.memory:
+            await asyncio.to_thread(self.memory.append, self.name, content)
+
     def think(self, goal: str) -> str:  # pragma: no cover - demo logic
         """Generate a thought for the goal using an optional LLM.
 
@@ -53,33 +68,50 @@ class BaseAgent:
     ) -> tuple[str, dict[str, object]]:  # pragma: no cover - demo logic
         """Like think(), but also returns debug metadata including raw LLM output.
 
-        Returns a tuple of (thought, debug_dict).
+        Returns a tuple of (thought, debug_dict). ``debug["prompt"]`` is None when no
+        provider is available, since no prompt is built in that case. With
+        ``AGENT_THINK_CACHE=1``, successful LLM thoughts are cached for
+        ``AGENT_THINK_CACHE_TTL`` seconds (default 300); ``debug["cache_hit"]`` tells
+        whether the provider call was skipped.
         """
         provider = self.llm or detect_llm()
-        prompt = (
-            f"Role: {self.role}. You are thinking step-by-step about the goal.\n"
-            f"Goal: {goal}\n"
-            "Return a single concise sentence capturing the next best thought."
-        )
         debug: dict[str, object] = {
             "provider": provider.__class__.__name__ if provider else None,
-            "prompt": prompt,
+            "prompt": None,
             "raw_response": None,
-            "used_fallback": False,
+            "used_fallback": True,
         }
-        if provider is not None:
+        thought = ""
+        pkey = provider_key(provider)
+        use_cache = (
+            provider is not None and pkey is not None and _env_truthy("AGENT_THINK_CACHE", "0")
+        )
+        cache_key = (self.role, " ".join(goal.split()), pkey)
+        cached = _THOUGHT_CACHE.get(cache_key) if use_cache else None
+        debug["cache_hit"] = cached is not None
+        if cached is not None:
+            debug["raw_response"] = thought = cached
+            debug["used_fallback"] = False
+        elif provider is not None:
+            # Stable per-agent system prefix + volatile goal turn (prompt-cache friendly);
+            # only built when a provider will actually consume them
+            system = (
+                f"Role: {self.role}. You are thinking step-by-step about the goal. "
+                "Return a single concise sentence capturing the next best thought."
+            )
+            user = f"Goal: {goal}"
+            debug["prompt"] = f"{system}\n{user}"
             try:
-                text = provider.generate(prompt).strip()
+                text = generate_chat(provider, system, user).strip()
                 debug["raw_response"] = text
-                thought = text or f"[{self.role}] Considering: {goal}"
-                if not text:
-                    debug["used_fallback"] = True
+                thought = text
+                debug["used_fallback"] = not text
             except RuntimeError:  # pragma: no cover - defensive
-                thought = f"[{self.role}] Considering: {goal}"
-                debug["used_fallback"] = True
-        else:
+                pass
+            if use_cache and thought:
+                _THOUGHT_CACHE.set(cache_key, thought)
+        if not thought:
             thought = f"[{self.role}] Considering: {goal}"
-            debug["used_fallback"] = True
         self.observe(thought)
         return thought, debug
 
@@ -91,13 +123,12 @@ class BaseAgent:
         """
         provider = self.llm or detect_llm()
         if provider is not None:
-            prompt = (
-                f"Role: {self.role}. Propose the next concrete action for the goal.\n"
-                f"Goal: {goal}\n"
+            system = (
+                f"Role: {self.role}. Propose the next concrete action for the goal. "
                 "Return a single imperative sentence describing the action."
             )
             try:
-                text = provider.generate(prompt).strip()
+                text = generate_chat(provider, system, f"Goal: {goal}").strip()
                 action = text or f"[{self.role}] Action for: {goal}"
             except RuntimeError:  # pragma: no cover - defensive
                 action = f"[{self.role}] Action for: {goal}"
@@ -0,0 +1,167 @@
+"""Small in-process caches shared by agents and LLM helpers.
+
+``LRUCache`` is a thread-safe, bounded mapping that evicts the least recently
+used entry and can optionally expire entries after a time-to-live. It exists so
+hot paths (expert selection, LLM round-trips) can memoize results without an
+external cache service. ``SemanticCache`` does the same for near-duplicate texts,
+matching lookups by bag-of-words cosine similarity instead of exact keys.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """Bounded least-recently-used cache with optional per-entry TTL.
+
+    Args:
+        maxsize: Maximum number of entries kept; the oldest is evicted first.
+        ttl: Seconds an entry stays valid after insertion; ``None`` disables expiry.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float | None = None) -> None:
+        self.maxsize = max(1, maxsize)
+        self.ttl = ttl
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> V | None:
+        """Return the cached value for ``key`` or None when missing/expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: K, value: V) -> None:
+        """Store ``value`` under ``key``, evicting the oldest entry when full."""
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _text_vector(text: str) -> tuple[dict[str, int], float]:
+    """Bag-of-words term counts of ``text`` and their Euclidean norm."""
+    counts: dict[str, int] = {}
+    for token in _TOKEN_RE.findall(text.lower()):
+        counts[token] = counts.get(token, 0) + 1
+    return counts, math.sqrt(sum(c * c for c in counts.values()))
+
+
+def _dot(a: dict[str, int], b: dict[str, int]) -> int:
+    """Dot product of two term-count vectors, iterating the smaller one."""
+    small, large = (a, b) if len(a) <= len(b) else (b, a)
+    return sum(count * large.get(token, 0) for token, count in small.items())
+
+
+class SemanticCache(Generic[V]):
+    """Bounded cache answering lookups for *similar* texts, not just identical ones.
+
+    Texts are compared by cosine similarity of their bag-of-words vectors; a lookup
+    hits the most similar entry in the same ``namespace`` whose similarity reaches
+    ``threshold``. Identical (whitespace/case-normalized) texts take a dict fast
+    path. Entries are evicted least recently used first and expire after ``ttl``.
+
+    Args:
+        maxsize: Maximum number of entries kept (also bounds the similarity scan).
+        ttl: Seconds an entry stays valid after insertion; ``None`` disables expiry.
+        threshold: Minimum cosine similarity in ``[0, 1]`` for a hit.
+    """
+
+    def __init__(
+        self, maxsize: int = 256, ttl: float | None = None, threshold: float = 0.85
+    ) -> None:
+        self.maxsize = max(1, maxsize)
+        self.ttl = ttl
+        self.threshold = threshold
+        self._data: OrderedDict[tuple[Hashable, str], tuple[float, dict[str, int], float, V]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return " ".join(text.lower().split())
+
+    def get(self, namespace: Hashable, text: str) -> V | None:
+        """Return the value stored for the text most similar to ``text``, or None."""
+        exact = (namespace, self._normalize(text))
+        now = time.monotonic()
+        with self._lock:
+            if self.ttl is not None:
+                expired = [k for k, e in self._data.items() if now - e[0] > self.ttl]
+                for key in expired:
+                    del self._data[key]
+            entry = self._data.get(exact)
+            if entry is not None:
+                self._data.move_to_end(exact)
+                return entry[3]
+            best_key = self._most_similar(namespace, text)
+            if best_key is None:
+                return None
+            self._data.move_to_end(best_key)
+            return self._data[best_key][3]
+
+    def _most_similar(self, namespace: Hashable, text: str) -> tuple[Hashable, str] | None:
+        """Key of the entry in ``namespace`` most similar to ``text`` above the threshold.
+
+        Caller must hold ``self._lock``.
+        """
+        vector, norm = _text_vector(text)
+        if not norm:
+            return None
+        best_key: tuple[Hashable, str] | None = None
+        best_score = self.threshold
+        for key, (_stored_at, other, other_norm, _value) in self._data.items():
+            if key[0] != namespace or not other_norm:
+                continue
+            score = _dot(vector, other) / (norm * other_norm)
+            if score >= best_score:
+                best_key, best_score = key, score
+        return best_key
+
+    def set(self, namespace: Hashable, text: str, value: V) -> None:
+        """Store ``value`` for ``text``, evicting the oldest entry when full."""
+        key = (namespace, self._normalize(text))
+        vector, norm = _text_vector(text)
+        with self._lock:
+            self._data[key] = (time.monotonic(), vector, norm, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -4,17 +4,50 @@ This module avoids hard dependencies: it tries providers only when the
 corresponding environment variables or libraries are present, otherwise it
 falls back to a no-op EchoLLM. Intended for local dev and CI without
 network/LMMs.
+
+Responses of the real providers (Ollama, OpenAI, Transformers) are cached per
+provider configuration and prompt; see ``_response_cached()``.
 """
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import functools
+import hashlib
 import importlib
+import importlib.util
+import json
 import os
-from dataclasses import dataclass
-from typing import Protocol
+import threading
+import weakref
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, ClassVar, Protocol, TypeVar
+
+from .cache import LRUCache
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import requests
+
+try:  # Optional fast JSON codec (bytes in/out, no str round-trip)
+    import orjson as _orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency fallback
+    _orjson = None  # type: ignore
+
+try:  # Optional shared backend for the response cache
+    import redis as _redis  # type: ignore
+    from redis.exceptions import RedisError as _RedisError  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency fallback
+    _redis = None  # type: ignore
 
-import requests
-import structlog
+    class _RedisError(Exception):  # type: ignore
+        """Fallback Redis error type when redis is not installed."""
+
+
+# Chat message as understood by chat-style APIs: {"role": ..., "content": ...}
+Message = dict[str, str]
 
 
 class LLM(Protocol):
@@ -25,7 +58,299 @@ class LLM(Protocol):
         raise NotImplementedError
 
 
-@dataclass(slots=True)
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def json_dumps(obj: Any, *, sort_keys: bool = False) -> bytes:
+    """Encode ``obj`` to compact UTF-8 JSON bytes, via orjson when installed.
+
+    The stdlib fallback uses the same compact separators and non-ASCII output, so
+    both paths produce identical bytes.
+    """
+    if _orjson is not None:
+        return _orjson.dumps(obj, option=_orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return json.dumps(  # pragma: no cover - optional dependency fallback
+        obj, sort_keys=sort_keys, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+
+
+def json_loads(data: bytes | str) -> Any:
+    """Decode JSON from bytes or str, via orjson when installed."""
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)  # pragma: no cover - optional dependency fallback
+
+
+@functools.lru_cache(maxsize=1)
+def _llm_debug_enabled() -> bool:
+    """Whether LLM request/response debug records are emitted (resolved once per process).
+
+    On with ``LLM_DEBUG=1`` or ``LOG_LEVEL=DEBUG``; otherwise the debug calls are skipped
+    before their keyword arguments (prompts, responses) are even collected.
+    """
+    return _env_truthy("LLM_DEBUG") or os.getenv("LOG_LEVEL", "INFO").strip().upper() == "DEBUG"
+
+
+@functools.lru_cache(maxsize=1)
+def _logger() -> Any:
+    """Return this module's logger; structlog is imported on first use, not at import."""
+    import structlog  # pylint: disable=import-outside-toplevel
+
+    return structlog.get_logger(__name__)
+
+
+@functools.lru_cache(maxsize=1)
+def _http_session() -> requests.Session:
+    """Return the process-wide pooled HTTP session used by HTTP-based providers.
+
+    Keeping one session preserves keep-alive connections across LLM calls, so
+    sequential prompts skip the TCP (and TLS) handshake. Pool size is taken from
+    ``OLLAMA_POOL_MAX`` (default 32); transient 502/503/504 answers are retried twice.
+    """
+    # Imported on first use: only HTTP-based providers pay for requests/urllib3
+    import requests  # pylint: disable=import-outside-toplevel
+    from requests.adapters import HTTPAdapter  # pylint: disable=import-outside-toplevel
+    from urllib3.util.retry import Retry  # pylint: disable=import-outside-toplevel
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=int(os.getenv("OLLAMA_POOL_MAX", "32")),
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.1,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"POST"}),
+            raise_on_status=False,
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# One pooled httpx.AsyncClient per event loop: connections are bound to the loop that
+# opened them, and sync callers (async_to_sync) may run views on short-lived loops.
+_ASYNC_CLIENTS: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _async_http_client() -> Any:
+    """Return the pooled ``httpx.AsyncClient`` of the running event loop.
+
+    Connection limits come from ``LLM_MAX_CONN`` (default 512 connections, 256
+    kept alive); httpx is imported on first use.
+    """
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(loop)
+    if client is None:
+        import httpx  # pylint: disable=import-outside-toplevel
+
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=int(os.getenv("LLM_MAX_CONN", "512")),
+                max_keepalive_connections=256,
+            )
+        )
+        _ASYNC_CLIENTS[loop] = client
+    return client
+
+
+# In-process LLM response cache (see _response_cached); shared via Redis when REDIS_URL is set
+_RESPONSE_CACHE: LRUCache[str, str] = LRUCache(maxsize=1024)
+_RESPONSE_CACHE_PREFIX = "llmcache:"
+
+_PromptT = TypeVar("_PromptT", str, list[Message])
+
+
+@functools.lru_cache(maxsize=1)
+def _response_cache_redis() -> Any:
+    """Return a Redis client for the response cache, or None to stay in-process."""
+    url = os.getenv("REDIS_URL")
+    if _redis is None or not url:
+        return None
+    try:  # pragma: no cover - requires a Redis server
+        client = _redis.Redis.from_url(url, decode_responses=True)
+        client.ping()
+        return client
+    except _RedisError:  # pragma: no cover - fallback path
+        return None
+
+
+def _response_cache_key(provider: object, prompt: object) -> str | None:
+    """Hash the provider configuration and prompt (or chat messages) into a cache key.
+
+    None when the provider has no stable key (see ``provider_key()``).
+    """
+    pkey = provider_key(provider)  # type: ignore[arg-type]
+    if pkey is None:
+        return None
+    payload = json_dumps({"provider": pkey, "prompt": prompt}, sort_keys=True)
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _response_cache_get(key: str) -> str | None:
+    """Look ``key`` up in the in-process cache, then in Redis when configured."""
+    cached = _RESPONSE_CACHE.get(key)
+    client = _response_cache_redis()
+    if cached is None and client is not None:  # pragma: no cover - requires Redis
+        try:
+            cached = client.get(_RESPONSE_CACHE_PREFIX + key)
+        except _RedisError:
+            cached = None
+    return cached
+
+
+def _response_cache_put(key: str, text: str) -> None:
+    """Store a non-empty response in the in-process cache (and Redis when configured)."""
+    if not text:
+        return
+    _RESPONSE_CACHE.set(key, text)
+    client = _response_cache_redis()
+    if client is not None:  # pragma: no cover - requires Redis
+        ttl = int(os.getenv("LLM_CACHE_TTL", "3600"))
+        with contextlib.suppress(_RedisError):
+            client.setex(_RESPONSE_CACHE_PREFIX + key, ttl, text)
+
+
+class _Flight:
+    """One in-progress upstream call that concurrent identical requests wait on."""
+
+    __slots__ = ("done", "error", "result")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: str | None = None
+        self.error: BaseException | None = None
+
+
+# Single-flight registries: concurrent identical uncached prompts share one upstream call.
+# Async flights are keyed per event loop because futures are bound to the loop creating them.
+_INFLIGHT: dict[str, _Flight] = {}
+_INFLIGHT_LOCK = threading.Lock()
+_AINFLIGHT: dict[tuple[int, str], asyncio.Future[str]] = {}
+
+
+def _single_flight(key: str, call: Callable[[], str]) -> str:
+    """Run ``call`` once per ``key`` at a time; concurrent callers get the same outcome."""
+    with _INFLIGHT_LOCK:
+        flight = _INFLIGHT.get(key)
+        leader = flight is None
+        if flight is None:
+            flight = _INFLIGHT[key] = _Flight()
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result or ""
+    try:
+        flight.result = call()
+        return flight.result
+    except BaseException as exc:
+        flight.error = exc
+        raise
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(key, None)
+        flight.done.set()
+
+
+async def _asingle_flight(key: str, call: Callable[[], Awaitable[str]]) -> str:
+    """Async counterpart of ``_single_flight()`` for coroutines on the running loop.
+
+    The upstream call runs as its own task that every caller awaits through
+    ``asyncio.shield()``: cancelling one caller (e.g. a disconnected client) only
+    cancels that caller, while the others still receive the shared result.
+    """
+    loop = asyncio.get_running_loop()
+    flight_key = (id(loop), key)
+    flight = _AINFLIGHT.get(flight_key)
+    if flight is None:
+        flight = _AINFLIGHT[flight_key] = asyncio.ensure_future(call())
+        flight.add_done_callback(functools.partial(_end_aflight, flight_key))
+    return await asyncio.shield(flight)
+
+
+def _end_aflight(flight_key: tuple[int, str], flight: asyncio.Future[str]) -> None:
+    if _AINFLIGHT.get(flight_key) is flight:
+        del _AINFLIGHT[flight_key]
+    if not flight.cancelled():
+        flight.exception()  # mark retrieved: callers (if any are left) re-raise it themselves
+
+
+def _llm_cache_enabled() -> bool:
+    return _env_truthy("ENABLE_LLM_CACHE", "0")
+
+
+def _response_cached(
+    method: Callable[[Any, _PromptT], str],
+) -> Callable[[Any, _PromptT], str]:
+    """Memoize a provider's generation method per (provider config, prompt).
+
+    Opt-in with ``ENABLE_LLM_CACHE=1``: providers sample (e.g. OpenAI at temperature
+    0.2), so replaying one answer for every identical prompt changes behaviour and
+    is only enabled deliberately. When on, identical prompts are answered from cache
+    without a round-trip and concurrent misses for the same prompt are coalesced
+    into one upstream call; entries expire after ``LLM_CACHE_TTL`` seconds in Redis.
+    Empty answers are not cached.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: Any, prompt: _PromptT) -> str:
+        key = _response_cache_key(self, prompt) if _llm_cache_enabled() else None
+        if key is None:
+            return method(self, prompt)
+        cached = _response_cache_get(key)
+        if cached is not None:
+            return cached
+
+        def _call() -> str:
+            text = method(self, prompt)
+            _response_cache_put(key, text)
+            return text
+
+        return _single_flight(key, _call)
+
+    return wrapper
+
+
+def _aresponse_cached(
+    method: Callable[[Any, str], Awaitable[str]],
+) -> Callable[[Any, str], Awaitable[str]]:
+    """Async counterpart of ``_response_cached()`` sharing the same cache entries.
+
+    In-process hits are answered on the loop; the Redis lookup (and its first-use
+    ping) and the cache write run in a worker thread so they never block it.
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self: Any, prompt: str) -> str:
+        key = _response_cache_key(self, prompt) if _llm_cache_enabled() else None
+        if key is None:
+            return await method(self, prompt)
+        cached = _RESPONSE_CACHE.get(key)
+        if cached is None:
+            cached = await asyncio.to_thread(_response_cache_get, key)
+        if cached is not None:
+            return cached
+
+        async def _call() -> str:
+            text = await method(self, prompt)
+            await asyncio.to_thread(_response_cache_put, key, text)
+            return text
+
+        return await _asingle_flight(key, _call)
+
+    return wrapper
+
+
+def clear_response_cache() -> None:
+    """Drop all in-process cached LLM responses."""
+    _RESPONSE_CACHE.clear()
+
+
+@dataclass(slots=True, eq=False, repr=False)
 class EchoLLM:
     """Deterministic fallback that echoes the prompt."""
 
@@ -33,14 +358,15 @@ class EchoLLM:
 
     def generate(self, prompt: str) -> str:  # pragma: no cover - trivial
         """Return the prompt unchanged, or with a prefix if configured."""
-        logger = structlog.get_logger(__name__)
-        logger.debug("llm.request", provider="echo", prompt=prompt)
+        if _llm_debug_enabled():
+            _logger().debug("llm.request", provider="echo", prompt=prompt)
         out = f"{self.prefix}{prompt}" if self.prefix else prompt
-        logger.debug("llm.response", provider="echo", response=out)
+        if _llm_debug_enabled():
+            _logger().debug("llm.response", provider="echo", response=out)
         return out
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False, repr=False)
 class OllamaLLM:
     """Ollama HTTP API client.
 
@@ -50,36 +376,116 @@ class OllamaLLM:
     host: str
     model: str = "llama3.1:8b"
     timeout: int = 20
+    _url: str = field(init=False, repr=False, default="")
 
+    def __post_init__(self) -> None:
+        """Resolve the generate endpoint once instead of on every call."""
+        self._url = self.host.rstrip("/") + "/api/generate"
+
+    @_response_cached
     def generate(self, prompt: str) -> str:
         """Call the Ollama HTTP API to generate text for the prompt."""
-        url = self.host.rstrip("/") + "/api/generate"
-        logger = structlog.get_logger(__name__)
-        logger.debug(
-            "llm.request",
-            provider="ollama",
-            url=url,
-            model=self.model,
-            prompt=prompt,
-        )
+        import requests  # pylint: disable=import-outside-toplevel
+
+        url = self._url
+        if _llm_debug_enabled():
+            _logger().debug(
+                "llm.request",
+                provider="ollama",
+                url=url,
+                model=self.model,
+                prompt=prompt,
+            )
         try:
-            resp = requests.post(
+            resp = _http_session().post(
                 url,
-                json={"model": self.model, "prompt": prompt, "stream": False},
+                data=json_dumps({"model": self.model, "prompt": prompt, "stream": False}),
+                headers=_JSON_HEADERS,
                 timeout=self.timeout,
             )
             resp.raise_for_status()
-            data = resp.json()
+            data = json_loads(resp.content)
             text = (data.get("response") or "").strip()
-            logger.debug("llm.response", provider="ollama", model=self.model, response=text)
+            if _llm_debug_enabled():
+                _logger().debug("llm.response", provider="ollama", model=self.model, response=text)
             return text
         except requests.RequestException as exc:  # pragma: no cover - network
             raise RuntimeError("ollama request failed") from exc
         except ValueError as exc:  # pragma: no cover - json
             raise RuntimeError("ollama bad response") from exc
 
+    @_aresponse_cached
+    async def agenerate(self, prompt: str) -> str:
+        """Async variant of ``generate()`` over the loop's pooled httpx client."""
+        import httpx  # pylint: disable=import-outside-toplevel
 
-@dataclass(slots=True)
+        if _llm_debug_enabled():
+            _logger().debug("llm.request", provider="ollama", url=self._url, model=self.model)
+        try:
+            resp = await _async_http_client().post(
+                self._url,
+                content=json_dumps({"model": self.model, "prompt": prompt, "stream": False}),
+                headers=_JSON_HEADERS,
+                timeout=self.timeout,
+            )
+            resp.raise_for_status()
+            text = (json_loads(resp.content).get("response") or "").strip()
+            if _llm_debug_enabled():
+                _logger().debug("llm.response", provider="ollama", model=self.model, response=text)
+            return text
+        except httpx.HTTPError as exc:  # pragma: no cover - network
+            raise RuntimeError("ollama request failed") from exc
+        except ValueError as exc:  # pragma: no cover - json
+            raise RuntimeError("ollama bad response") from exc
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """Yield completion text chunks as Ollama produces them (``"stream": true``)."""
+        import requests  # pylint: disable=import-outside-toplevel
+
+        try:
+            with _http_session().post(
+                self._url,
+                data=json_dumps({"model": self.model, "prompt": prompt, "stream": True}),
+                headers=_JSON_HEADERS,
+                timeout=self.timeout,
+                stream=True,
+            ) as resp:
+                resp.raise_for_status()
+                for line in resp.iter_lines():
+                    if line:
+                        chunk = json_loads(line).get("response")
+                        if chunk:
+                            yield chunk
+        except requests.RequestException as exc:  # pragma: no cover - network
+            raise RuntimeError("ollama request failed") from exc
+        except ValueError as exc:  # pragma: no cover - json
+            raise RuntimeError("ollama bad response") from exc
+
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        """Async variant of ``stream()`` over the loop's pooled httpx client."""
+        import httpx  # pylint: disable=import-outside-toplevel
+
+        try:
+            async with _async_http_client().stream(
+                "POST",
+                self._url,
+                content=json_dumps({"model": self.model, "prompt": prompt, "stream": True}),
+                headers=_JSON_HEADERS,
+                timeout=self.timeout,
+            ) as resp:
+                resp.raise_for_status()
+                async for line in resp.aiter_lines():
+                    if line:
+                        chunk = json_loads(line).get("response")
+                        if chunk:
+                            yield chunk
+        except httpx.HTTPError as exc:  # pragma: no cover - network
+            raise RuntimeError("ollama request failed") from exc
+        except ValueError as exc:  # pragma: no cover - json
+            raise RuntimeError("ollama bad response") from exc
+
+
+@dataclass(slots=True, eq=False, repr=False)
 class OpenAILLM:
     """OpenAI Chat API client using the v1 python SDK.
 
@@ -87,37 +493,98 @@ class OpenAILLM:
     """
 
     model: str = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    _client: Any = field(init=False, repr=False, default=None)
+
+    # Shared, immutable system turn prepended to plain prompts
+    _SYSTEM_MESSAGE: ClassVar[Message] = {
+        "role": "system",
+        "content": "You are a helpful agile software assistant.",
+    }
 
     def generate(self, prompt: str) -> str:  # pragma: no cover - external
         """Generate a response using the OpenAI Chat Completions API."""
+        return self.generate_messages([self._SYSTEM_MESSAGE, {"role": "user", "content": prompt}])
+
+    def _get_client(self) -> Any:  # pragma: no cover - external
+        """Return the SDK client, creating it (and its pooled httpx client) on first use.
+
+        Reusing one client keeps keep-alive connections to the API host across calls.
+        Pool limits come from ``OPENAI_MAX_CONN`` (100) and ``OPENAI_MAX_KEEPALIVE`` (50).
+        """
+        if self._client is None:
+            try:
+                openai_mod = importlib.import_module("openai")  # type: ignore
+                import httpx  # pylint: disable=import-outside-toplevel
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                raise RuntimeError("openai SDK not available") from exc
+            self._client = openai_mod.OpenAI(
+                http_client=httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=int(os.getenv("OPENAI_MAX_CONN", "100")),
+                        max_keepalive_connections=int(os.getenv("OPENAI_MAX_KEEPALIVE", "50")),
+                    ),
+                    timeout=30,
+                )
+            )
+        return self._client
+
+    @_response_cached
+    def generate_messages(self, messages: list[Message]) -> str:  # pragma: no cover - external
+        """Generate a response for chat ``messages`` (system prefix first, then user turns)."""
+        client = self._get_client()
         try:
-            openai_mod = importlib.import_module("openai")  # type: ignore
-        except Exception as exc:  # pragma: no cover  # pylint: disable=broad-exception-caught
-            raise RuntimeError("openai SDK not available") from exc
-        try:
-            client = openai_mod.OpenAI()
-            logger = structlog.get_logger(__name__)
-            logger.debug("llm.request", provider="openai", model=self.model, prompt=prompt)
+            if _llm_debug_enabled():
+                _logger().debug(
+                    "llm.request", provider="openai", model=self.model, messages=messages
+                )
             res = client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful agile software assistant.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
+                messages=messages,
                 temperature=0.2,
                 max_tokens=300,
             )
             text = (res.choices[0].message.content or "").strip()
-            logger.debug("llm.response", provider="openai", model=self.model, response=text)
+            if _llm_debug_enabled():
+                _logger().debug("llm.response", provider="openai", model=self.model, response=text)
             return text
         except Exception as exc:  # pragma: no cover  # pylint: disable=broad-exception-caught
             raise RuntimeError("openai request failed") from exc
 
+    def stream(self, prompt: str) -> Iterator[str]:  # pragma: no cover - external
+        """Yield completion text deltas from a streamed chat completion."""
+        client = self._get_client()
+        try:
+            chunks = client.chat.completions.create(
+                model=self.model,
+                messages=[self._SYSTEM_MESSAGE, {"role": "user", "content": prompt}],
+                temperature=0.2,
+                max_tokens=300,
+                stream=True,
+            )
+            for chunk in chunks:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            raise RuntimeError("openai request failed") from exc
+
+
+def _transformers_model_kwargs(torch_mod: Any) -> dict[str, Any]:
+    """Model loading options for the hardware at hand.
 
-@dataclass(slots=True)
+    ``device_map`` requires accelerate, and bfloat16 only pays off where the device
+    computes in it natively (CUDA with bf16 support); CPUs keep the default dtype.
+    """
+    model_kwargs: dict[str, Any] = {}
+    if importlib.util.find_spec("accelerate") is not None:
+        model_kwargs["device_map"] = "auto"
+    cuda = getattr(torch_mod, "cuda", None)
+    if cuda is not None and cuda.is_available() and cuda.is_bf16_supported():
+        model_kwargs["torch_dtype"] = torch_mod.bfloat16
+    return model_kwargs
+
+
+@dataclass(slots=True, eq=False, repr=False)
 class TransformersLLM:
     """Local Transformers pipeline if available.
 
@@ -127,70 +594,245 @@ class TransformersLLM:
 
     model: str
     max_new_tokens: int = 256
+    _pipe: Any = field(init=False, repr=False, default=None)
 
     def __post_init__(self) -> None:  # pragma: no cover - optional
-        """Lazily import transformers and create a text-generation pipeline."""
+        """Lazily import transformers and create a text-generation pipeline.
+
+        With torch available the weights load in bfloat16 on CUDA devices that
+        support it, are placed with ``device_map="auto"`` when accelerate is installed,
+        and the model is wrapped in ``torch.compile`` unless ``TRANSFORMERS_COMPILE=0``.
+        """
         try:
             transformers_mod = importlib.import_module("transformers")  # type: ignore
         except Exception as exc:  # pragma: no cover  # pylint: disable=broad-exception-caught
             raise RuntimeError("transformers not available") from exc
+        try:
+            torch_mod: Any = importlib.import_module("torch")
+        except ImportError:
+            torch_mod = None
+        kwargs: dict[str, Any] = {}
+        if torch_mod is not None:
+            model_kwargs = _transformers_model_kwargs(torch_mod)
+            if model_kwargs:
+                kwargs["model_kwargs"] = model_kwargs
         self._pipe = transformers_mod.pipeline(
             "text-generation",
             model=self.model,
             tokenizer=self.model,
             max_new_tokens=self.max_new_tokens,
+            **kwargs,
         )
-
+        if torch_mod is not None and _env_truthy("TRANSFORMERS_COMPILE", "1"):
+            # Compilation is an optimization only; keep the eager model if it fails
+            with contextlib.suppress(Exception):
+                self._pipe.model = torch_mod.compile(
+                    self._pipe.model, mode="reduce-overhead", fullgraph=False
+                )
+        tokenizer = getattr(self._pipe, "tokenizer", None)
+        if tokenizer is not None and tokenizer.pad_token_id is None:
+            # Batched generation pads prompts; causal LMs often ship without a pad token
+            tokenizer.pad_token_id = tokenizer.eos_token_id
+
+    @_response_cached
     def generate(self, prompt: str) -> str:  # pragma: no cover - optional
         """Generate text locally using the transformers pipeline."""
-        logger = structlog.get_logger(__name__)
-        logger.debug("llm.request", provider="transformers", model=self.model, prompt=prompt)
+        if _llm_debug_enabled():
+            _logger().debug("llm.request", provider="transformers", model=self.model, prompt=prompt)
         try:
             out = self._pipe(prompt)
             text = out[0]["generated_text"]
             text = text.strip()
-            logger.debug("llm.response", provider="transformers", model=self.model, response=text)
+            if _llm_debug_enabled():
+                _logger().debug(
+                    "llm.response", provider="transformers", model=self.model, response=text
+                )
             return text
         except Exception as exc:  # pragma: no cover  # pylint: disable=broad-exception-caught
             raise RuntimeError("transformers generation failed") from exc
 
+    def batch_generate(self, prompts: list[str]) -> list[str]:  # pragma: no cover - optional
+        """Generate completions for several prompts in one batched forward pass.
+
+        Prompts already in the response cache are answered from it; only the misses
+        go through the pipeline, together, with ``batch_size=len(misses)``.
+        """
+        use_cache = _llm_cache_enabled() and provider_key(self) is not None
+        keys = [_response_cache_key(self, p) or "" for p in prompts] if use_cache else []
+        results: list[str | None] = (
+            [_response_cache_get(k) for k in keys] if use_cache else [None] * len(prompts)
+        )
+        misses = [i for i, text in enumerate(results) if text is None]
+        if misses:
+            try:
+                outs = self._pipe([prompts[i] for i in misses], batch_size=len(misses))
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                raise RuntimeError("transformers generation failed") from exc
+            for i, out in zip(misses, outs, strict=True):
+                text = out[0]["generated_text"].strip()
+                results[i] = text
+                if use_cache:
+                    _response_cache_put(keys[i], text)
+        return [text or "" for text in results]
+
+
+def generate_chat(provider: LLM, system: str, user: str) -> str:
+    """Generate a completion from a stable ``system`` prefix and a volatile ``user`` turn.
+
+    Providers exposing ``generate_messages(messages)`` receive proper chat messages,
+    so the identical system message across calls can hit provider-side prompt
+    caches. Others get one prompt with the system text first, which keeps the
+    invariant part as a shared prefix.
+    """
+    generate_messages = getattr(provider, "generate_messages", None)
+    if callable(generate_messages):
+        return generate_messages(
+            [{"role": "system", "content": system}, {"role": "user", "content": user}]
+        )
+    return provider.generate(f"{system}\n{user}")
+
+
+async def agenerate(provider: LLM, prompt: str) -> str:
+    """Generate a completion without blocking the event loop.
+
+    Uses the provider's native ``agenerate()`` when available (e.g. OllamaLLM over
+    httpx); otherwise runs the blocking ``generate()`` in a worker thread.
+    """
+    native = getattr(provider, "agenerate", None)
+    if callable(native):
+        return await native(prompt)
+    return await asyncio.to_thread(provider.generate, prompt)
+
+
+def stream_generate(provider: LLM, prompt: str) -> Iterator[str]:
+    """Yield completion chunks; providers without ``stream()`` yield one full answer."""
+    native = getattr(provider, "stream", None)
+    if callable(native):
+        yield from native(prompt)
+    else:
+        yield provider.generate(prompt)
+
+
+async def astream_generate(provider: LLM, prompt: str) -> AsyncIterator[str]:
+    """Async variant of ``stream_generate()``.
+
+    Falls back to the provider's sync ``stream()`` (or ``agenerate()``) in a worker
+    thread so the event loop is never blocked by a provider lacking ``astream()``.
+    """
+    native = getattr(provider, "astream", None)
+    if callable(native):
+        async for chunk in native(prompt):
+            yield chunk
+        return
+    if callable(getattr(provider, "stream", None)):
+        chunks = iter(stream_generate(provider, prompt))
+        done = object()
+        while (chunk := await asyncio.to_thread(next, chunks, done)) is not done:
+            yield chunk  # type: ignore[misc]
+        return
+    yield await agenerate(provider, prompt)
+
+
+def generate_many(provider: LLM, prompts: Sequence[str], max_workers: int = 8) -> list[str | None]:
+    """Generate completions for several prompts in one batch.
+
+    Providers exposing ``batch_generate(prompts)`` handle the batch natively;
+    otherwise prompts are fanned out over a thread pool so their round-trips
+    overlap. Results keep prompt order; a prompt whose generation failed with
+    ``RuntimeError`` yields None.
+    """
+    batch = getattr(provider, "batch_generate", None)
+    if callable(batch):
+        try:
+            return list(batch(list(prompts)))
+        except RuntimeError:  # pragma: no cover - defensive
+            return [None] * len(prompts)
+
+    def _one(prompt: str) -> str | None:
+        try:
+            return provider.generate(prompt)
+        except RuntimeError:
+            return None
+
+    if len(prompts) <= 1:
+        return [_one(p) for p in prompts]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(prompts))) as pool:
+        return list(pool.map(_one, prompts))
+
+
+def provider_key(provider: LLM | None) -> str | None:
+    """Return a stable cache key identifying a provider configuration.
+
+    Built-in providers are keyed by class plus model/host settings so equal
+    configurations share cache entries. Foreign objects without such settings
+    return None: callers must not cache their results, since an identity-based key
+    could be reused by a different object after garbage collection.
+    """
+    if provider is None:
+        return "none"
+    parts = [provider.__class__.__name__]
+    for attr in ("model", "host", "prefix"):
+        value = getattr(provider, attr, None)
+        if value is not None:
+            parts.append(f"{attr}={value}")
+    return ":".join(parts) if len(parts) > 1 else None
+
+
+@functools.lru_cache(maxsize=64)
+def _truthy(value: str | None, default: str = "0") -> bool:
+    # Memoized: flags take a handful of distinct values, so repeat parses are a dict hit
+    return (default if value is None else value).strip().lower() in {"1", "true", "yes", "on"}
+
 
 def _env_truthy(name: str, default: str = "0") -> bool:
-    val = os.getenv(name, default).strip().lower()
-    return val in {"1", "true", "yes", "on"}
+    return _truthy(os.getenv(name), default)
+
+
+# Environment variables that influence provider detection (the detection cache key)
+_DETECT_ENV = ("ENABLE_LLM", "OPENAI_API_KEY", "OLLAMA_HOST", "OLLAMA_MODEL", "TRANSFORMERS_MODEL")
 
 
 def detect_llm() -> LLM | None:
     """Detect and create an LLM provider if explicitly enabled.
 
     Order: OPENAI -> OLLAMA -> TRANSFORMERS. Returns None if disabled or
-    provider cannot be initialized.
+    provider cannot be initialized. The provider is created once per distinct
+    combination of the relevant environment variables and reused afterwards;
+    call ``reset_llm_cache()`` to force re-detection.
     """
-    if not _env_truthy("ENABLE_LLM", "0"):
-        return None
+    return _detect_llm_cached(tuple(os.environ.get(name) for name in _DETECT_ENV))
 
-    # OpenAI
-    if os.getenv("OPENAI_API_KEY"):
-        try:
-            return OpenAILLM()
-        except Exception:  # pragma: no cover  # pylint: disable=broad-exception-caught
-            pass
 
-    # Ollama
-    host = os.getenv("OLLAMA_HOST")
-    if host:
-        try:
-            return OllamaLLM(host=host, model=os.getenv("OLLAMA_MODEL", "llama3.1:8b"))
-        except Exception:  # pragma: no cover  # pylint: disable=broad-exception-caught
-            pass
+def reset_llm_cache() -> None:
+    """Forget cached provider detections (e.g., after changing settings in tests)."""
+    _detect_llm_cached.cache_clear()
 
-    # Transformers
-    model = os.getenv("TRANSFORMERS_MODEL")
-    if model:
-        try:
-            return TransformersLLM(model=model)
-        except Exception:  # pragma: no cover  # pylint: disable=broad-exception-caught
-            pass
 
+# Provider detection chain, tried in order: (env var that must be set, factory taking the
+# env snapshot). Extend here instead of branching in _detect_llm_cached().
+_PROVIDER_CHAIN: tuple[tuple[str, Callable[[dict[str, str | None]], LLM]], ...] = (
+    ("OPENAI_API_KEY", lambda env: OpenAILLM()),
+    (
+        "OLLAMA_HOST",
+        lambda env: OllamaLLM(
+            host=env["OLLAMA_HOST"] or "", model=env["OLLAMA_MODEL"] or "llama3.1:8b"
+        ),
+    ),
+    ("TRANSFORMERS_MODEL", lambda env: TransformersLLM(model=env["TRANSFORMERS_MODEL"] or "")),
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _detect_llm_cached(env: tuple[str | None, ...]) -> LLM | None:
+    """Create the provider for an environment snapshot; see ``detect_llm()``."""
+    values = dict(zip(_DETECT_ENV, env, strict=True))
+    if not _truthy(values["ENABLE_LLM"]):
+        return None
+    for required, factory in _PROVIDER_CHAIN:
+        if values[required]:
+            try:
+                return factory(values)
+            except Exception:  # pragma: no cover  # pylint: disable=broad-exception-caught
+                continue
     # Last resort
     return EchoLLM(prefix="[echo] ")
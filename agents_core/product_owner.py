@@ -2,16 +2,36 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import os
 import re
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 
-from memory.long_term import KnowledgeGraph
+from memory.long_term import get_knowledge_graph
 
 from .base import BaseAgent
-from .llm import detect_llm
+from .cache import SemanticCache
+from .dynamic_expert import ExpertSelection, select_experts_from_tasks
+from .llm import (
+    LLM,
+    _env_truthy,
+    agenerate,
+    astream_generate,
+    detect_llm,
+    generate_many,
+    provider_key,
+)
 
+# Accept '-', '*', '•', en dash '–', with optional escape '\-' from LLM,
+# or numbered lists like '1.'/'1)'. Multiline so one finditer() sweep parses the whole
+# answer; [^\S\n] is "whitespace except newline" and the greedy (.*\S) ends the item at
+# the line's last non-space character (equivalent to the former per-line strip()).
+_BULLET_RE = re.compile(r"(?m)^[^\S\n]*(?:\\?[-*•–]|\d+[\.)])[^\S\n]+(.*\S)")
 
-@dataclass(slots=True)
+
+@dataclass(slots=True, eq=False, repr=False)
 class ProductOwnerAgent(BaseAgent):
     """Product Owner agent responsible for backlog and stakeholder alignment."""
 
@@ -30,51 +50,220 @@ class ProductOwnerAgent(BaseAgent):
         Returns (tasks, debug_dict).
         """
         self.observe(f"planning: {description}")
-        tasks: list[str] = []
         provider = self.llm or detect_llm()
-        prompt = (
-            "You are a Product Owner. Create a list of actionable tasks for the "
-            "following description.\n"
-            f"Description: {description}\n"
-            "Return output as lines starting with '- '. No extra text."
-        )
-        debug: dict[str, object] = {
-            "provider": provider.__class__.__name__ if provider else None,
-            "prompt": prompt,
-            "raw_response": None,
-            "parsed_lines": [],
-            "used_fallback": False,
-        }
-        if provider is not None:
+        text: str | None = None
+        if provider is None:
+            debug = _plan_debug(None, None)
+        else:
+            prompt = _plan_prompt(description)
+            debug = _plan_debug(provider, prompt)
+            cached = _cached_plan(provider, description, debug)
+            if cached is not None:
+                self._record_plan(description, cached)
+                return cached, debug
             try:
                 text = provider.generate(prompt)
-                debug["raw_response"] = text
-                # Accept '-', '*', '•', en dash '–', with optional escape '\-' from LLM,
-                # or numbered lists like '1.'/'1)'.
-                pattern = r"^\s*(?:\\?[-*•–]|\d+[\.)])\s+(.*)$"
-                parsed: list[str] = []
-                for line in text.splitlines():
-                    line = line.strip()
-                    m = re.match(pattern, line)
-                    if m:
-                        parsed.append(m.group(1).strip())
-                debug["parsed_lines"] = parsed
-                # Use all parsed tasks without limiting to two
-                tasks = [t for t in parsed if t]
             except RuntimeError:  # pragma: no cover - defensive
-                tasks = []
-                debug["used_fallback"] = True
-        # Deterministic fallback only if no tasks could be parsed
-        if len(tasks) == 0:
-            tasks = [
-                f"Define acceptance criteria for: {description}",
-                f"Identify needed experts for: {description}",
-            ]
-            debug["used_fallback"] = True
-        # Store a brief note in long-term memory (no-op if Neo4j not configured)
-        try:
-            kg = KnowledgeGraph()
-            kg.upsert_note(self.name, f"planned {len(tasks)} task(s) for: {description}")
-        except Exception:  # pragma: no cover - defensive  # pylint: disable=broad-exception-caught
-            pass
+                text = None
+        tasks = _tasks_from_response(description, text, debug)
+        _remember_plan(provider, description, tasks, debug)
+        self._record_plan(description, tasks)
         return tasks, debug
+
+    def plan_and_select(self, description: str) -> tuple[list[str], ExpertSelection]:
+        """Plan ``description`` and select the experts its tasks need, in one call.
+
+        The task list feeds expert selection directly, and selection consults this
+        agent's LLM (or the detected one), as ``plan_work()`` does.
+        """
+        tasks = self.plan_work(description)
+        return tasks, select_experts_from_tasks(tasks, llm=self.llm)
+
+    def plan_many(self, descriptions: list[str]) -> list[list[str]]:
+        """Plan several descriptions with one batched LLM call; results keep input order.
+
+        Uses ``agents_core.llm.generate_many()``, so providers with a native batch
+        path (e.g. ``TransformersLLM``) answer all prompts in a single forward pass.
+        """
+        provider = self.llm or detect_llm()
+        for description in descriptions:
+            self.observe(f"planning: {description}")
+        texts: list[str | None] = [None] * len(descriptions)
+        if provider is not None and descriptions:
+            texts = generate_many(provider, [_plan_prompt(d) for d in descriptions])
+        plans: list[list[str]] = []
+        for description, text in zip(descriptions, texts, strict=True):
+            tasks = _tasks_from_response(description, text, {})
+            self._record_plan(description, tasks)
+            plans.append(tasks)
+        return plans
+
+    async def aplan_work(self, description: str) -> list[str]:
+        """Async variant of plan_work(); awaits the LLM instead of blocking."""
+        tasks, _debug = await self.aplan_work_debug(description)
+        return tasks
+
+    async def aplan_work_debug(self, description: str) -> tuple[list[str], dict[str, object]]:
+        """Async variant of plan_work_debug() using ``agents_core.llm.agenerate()``."""
+        await self.aobserve(f"planning: {description}")
+        provider = self.llm or detect_llm()
+        text: str | None = None
+        if provider is None:
+            debug = _plan_debug(None, None)
+        else:
+            prompt = _plan_prompt(description)
+            debug = _plan_debug(provider, prompt)
+            cached = _cached_plan(provider, description, debug)
+            if cached is not None:
+                if get_knowledge_graph().enabled:
+                    await asyncio.to_thread(self._record_plan, description, cached)
+                return cached, debug
+            try:
+                text = await agenerate(provider, prompt)
+            except RuntimeError:  # pragma: no cover - defensive
+                text = None
+        tasks = _tasks_from_response(description, text, debug)
+        _remember_plan(provider, description, tasks, debug)
+        if get_knowledge_graph().enabled:
+            await asyncio.to_thread(self._record_plan, description, tasks)
+        return tasks, debug
+
+    async def aplan_many(self, descriptions: list[str]) -> list[list[str]]:
+        """Plan several descriptions concurrently; results keep input order."""
+        return list(await asyncio.gather(*(self.aplan_work(d) for d in descriptions)))
+
+    async def stream_tasks(self, description: str) -> AsyncIterator[str]:
+        """Yield planned tasks as soon as each bullet line of the LLM answer completes.
+
+        The first task arrives at roughly the model's time-to-first-line instead of
+        after the full completion. Falls back to the deterministic tasks when
+        nothing could be parsed.
+        """
+        await self.aobserve(f"planning: {description}")
+        provider = self.llm or detect_llm()
+        tasks: list[str] = []
+        if provider is not None:
+            pending = ""
+            try:
+                async for chunk in astream_generate(provider, _plan_prompt(description)):
+                    *complete, pending = (pending + chunk).split("\n")
+                    for line in complete:
+                        if task := _bullet_item(line):
+                            tasks.append(task)
+                            yield task
+                if task := _bullet_item(pending):
+                    tasks.append(task)
+                    yield task
+            except RuntimeError:  # pragma: no cover - defensive
+                pass
+        if not tasks:
+            tasks = _fallback_tasks(description)
+            for task in tasks:
+                yield task
+        if get_knowledge_graph().enabled:
+            await asyncio.to_thread(self._record_plan, description, tasks)
+
+    def _record_plan(self, description: str, tasks: list[str]) -> None:
+        """Store a brief note in long-term memory (no-op if Neo4j not configured)."""
+        # Shared per-process graph: the Neo4j driver handshake happens at most once
+        kg = get_knowledge_graph()
+        if not kg.enabled:
+            return
+        with contextlib.suppress(Exception):  # pragma: no cover - defensive
+            kg.upsert_note(self.name, f"planned {len(tasks)} task(s) for: {description}")
+
+
+# Constant prompt/fallback chunks; per-call work is a concatenation around the description
+_PLAN_PROMPT_PREFIX = (
+    "You are a Product Owner. Create a list of actionable tasks for the "
+    "following description.\n"
+    "Description: "
+)
+_PLAN_PROMPT_SUFFIX = "\nReturn output as lines starting with '- '. No extra text."
+_FALLBACK_ACCEPTANCE = "Define acceptance criteria for: "
+_FALLBACK_EXPERTS = "Identify needed experts for: "
+
+
+# Plans for near-duplicate descriptions (opt-in, see ``_plan_cache_enabled``)
+_PLAN_CACHE: SemanticCache[tuple[str, ...]] = SemanticCache(
+    maxsize=256,
+    ttl=float(os.getenv("AGENT_SEMANTIC_CACHE_TTL", "600")),
+    threshold=float(os.getenv("AGENT_SEMANTIC_CACHE_THRESHOLD", "0.85")),
+)
+# Descriptions about live state must not be answered from an older plan
+_LIVE_STATE_RE = re.compile(
+    r"\b(?:now|today|current(?:ly)?|latest|live|status|heute|aktuell(?:e[nrs]?)?)\b", re.I
+)
+
+
+def _plan_cache_enabled(description: str) -> bool:
+    return _env_truthy("AGENT_SEMANTIC_CACHE", "0") and not _LIVE_STATE_RE.search(description)
+
+
+def _cached_plan(provider: LLM, description: str, debug: dict[str, object]) -> list[str] | None:
+    """Return tasks planned earlier for a similar description, updating ``debug``."""
+    pkey = provider_key(provider)
+    if pkey is None or not _plan_cache_enabled(description):
+        return None
+    cached = _PLAN_CACHE.get(pkey, description)
+    if cached is None:
+        return None
+    debug["cache_hit"] = True
+    debug["parsed_lines"] = list(cached)
+    return list(cached)
+
+
+def _remember_plan(
+    provider: LLM, description: str, tasks: list[str], debug: dict[str, object]
+) -> None:
+    """Cache LLM-derived tasks; fallback tasks embed the description and are not reused."""
+    pkey = provider_key(provider)
+    if pkey is not None and not debug["used_fallback"] and _plan_cache_enabled(description):
+        _PLAN_CACHE.set(pkey, description, tuple(tasks))
+
+
+def _plan_prompt(description: str) -> str:
+    """Build the planning prompt for ``description``."""
+    return _PLAN_PROMPT_PREFIX + description + _PLAN_PROMPT_SUFFIX
+
+
+def _plan_debug(provider: LLM | None, prompt: str | None) -> dict[str, object]:
+    """Return the initial planning debug block (``prompt`` is None without a provider)."""
+    return {
+        "provider": provider.__class__.__name__ if provider else None,
+        "prompt": prompt,
+        "raw_response": None,
+        "parsed_lines": [],
+        "used_fallback": False,
+        "cache_hit": False,
+    }
+
+
+def _tasks_from_response(description: str, text: str | None, debug: dict[str, object]) -> list[str]:
+    """Parse LLM bullet lines into tasks, falling back to deterministic tasks.
+
+    ``text`` is None when no provider was available or the call failed.
+    """
+    tasks: list[str] = []
+    if text is not None:
+        debug["raw_response"] = text
+        parsed = [m.group(1) for m in _BULLET_RE.finditer(text)]
+        debug["parsed_lines"] = parsed
+        # Use all parsed tasks without limiting to two
+        tasks = [t for t in parsed if t]
+    # Deterministic fallback only if no tasks could be parsed
+    if len(tasks) == 0:
+        tasks = _fallback_tasks(description)
+        debug["used_fallback"] = True
+    return tasks
+
+
+def _fallback_tasks(description: str) -> list[str]:
+    """Deterministic tasks used when the LLM yields nothing parseable."""
+    return [_FALLBACK_ACCEPTANCE + description, _FALLBACK_EXPERTS + description]
+
+
+def _bullet_item(line: str) -> str | None:
+    """Return the task text of a single bullet line, or None if it is not a bullet."""
+    m = _BULLET_RE.match(line)
+    return m.group(1) if m else None
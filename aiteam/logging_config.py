@@ -0,0 +1,24 @@
+"""Structured logging setup for the AITEAM project.
+
+Kept out of ``aiteam.settings`` so importing settings (e.g. for management
+commands) does not pull in structlog; ``apps.api.apps.ApiConfig.ready()`` calls
+``configure_structlog()`` once Django has loaded its settings.
+"""
+
+from __future__ import annotations
+
+
+def configure_structlog(*, debug: bool, level: int) -> None:
+    """Configure structlog processors and level filtering for the process."""
+    import structlog  # pylint: disable=import-outside-toplevel
+
+    structlog.configure(
+        processors=[
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.add_log_level,
+            (structlog.dev.ConsoleRenderer() if debug else structlog.processors.JSONRenderer()),
+        ],
+        wrapper_class=structlog.make_filtering_bound_logger(level),
+        context_class=dict,
+        cache_logger_on_first_use=True,
+    )
@@ -11,7 +11,6 @@ import os
 from datetime import timedelta
 from pathlib import Path
 
-import structlog
 from dotenv import load_dotenv
 
 # Base paths
@@ -21,9 +20,9 @@ load_dotenv()  # Load from .env if present
 # Security & basic config
 SECRET_KEY = os.getenv("DJANGO_SECRET_KEY", "dev-secret-key-not-for-prod")
 DEBUG = os.getenv("DJANGO_DEBUG", "0").lower() in {"1", "true", "yes"}
-ALLOWED_HOSTS = [
-    h.strip() for h in os.getenv("ALLOWED_HOSTS", "127.0.0.1,localhost").split(",") if h.strip()
-]
+ALLOWED_HOSTS = tuple(
+    filter(None, map(str.strip, os.getenv("ALLOWED_HOSTS", "127.0.0.1,localhost").split(",")))
+)
 
 # Logging level (controls structlog and Django loggers)
 LOG_LEVEL_NAME = os.getenv("LOG_LEVEL", "INFO").upper()
@@ -96,7 +95,9 @@ USE_TZ = True
 # Static & media
 STATIC_URL = "/static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
-STATICFILES_DIRS = [BASE_DIR / "static"] if (BASE_DIR / "static").exists() else []
+# Not gated on DEBUG: production collectstatic needs this directory too (one stat per start)
+_STATIC_DIR = BASE_DIR / "static"
+STATICFILES_DIRS = (_STATIC_DIR,) if _STATIC_DIR.is_dir() else ()
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -157,17 +158,8 @@ NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "please-change")
 OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 
-# Structlog configuration
-structlog.configure(
-    processors=[
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.add_log_level,
-        (structlog.dev.ConsoleRenderer() if DEBUG else structlog.processors.JSONRenderer()),
-    ],
-    wrapper_class=structlog.make_filtering_bound_logger(LOG_LEVEL),
-    context_class=dict,
-    cache_logger_on_first_use=True,
-)
+# Structlog is configured in apps.api.apps.ApiConfig.ready() (see aiteam/logging_config.py)
+# so importing settings stays cheap for management commands.
 
 LOGGING = {
     "version": 1,
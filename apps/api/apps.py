@@ -0,0 +1,23 @@
+"""Django app configuration for the API application."""
+
+from __future__ import annotations
+
+from django.apps import AppConfig
+
+
+class ApiConfig(AppConfig):
+    """AppConfig for the REST API; also configures structured logging on startup."""
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.api"
+    verbose_name = "API"
+
+    def ready(self) -> None:
+        """Configure structlog from the loaded Django settings."""
+        from django.conf import settings  # pylint: disable=import-outside-toplevel
+
+        from aiteam.logging_config import (  # pylint: disable=import-outside-toplevel
+            configure_structlog,
+        )
+
+        configure_structlog(debug=settings.DEBUG, level=settings.LOG_LEVEL)
@@ -44,9 +44,17 @@ class ACFeedbackRequestSerializer(serializers.Serializer):
 
 
 class MemoryAppendSerializer(serializers.Serializer):
-    """Validate input for appending to short-term memory."""
+    """Validate input for appending to short-term memory (``item`` or ``items``)."""
 
-    item = serializers.CharField(max_length=4000)
+    item = serializers.CharField(max_length=4000, required=False)
+    items = serializers.ListField(
+        child=serializers.CharField(max_length=4000), required=False, max_length=100
+    )
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        if ("item" in attrs) == ("items" in attrs):
+            raise serializers.ValidationError("Provide exactly one of 'item' or 'items'.")
+        return attrs
 
     def create(self, validated_data: dict[str, Any]) -> dict[str, Any]:  # pragma: no cover
         return validated_data
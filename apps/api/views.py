@@ -2,25 +2,41 @@
 
 from __future__ import annotations
 
+import asyncio
 import contextlib
+import hmac
 import json
 import os
 import threading
 import time
-from collections.abc import Callable
-from functools import wraps
+import weakref
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from functools import lru_cache, wraps
 from typing import Any
 
-from django.http import HttpRequest, JsonResponse
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    HttpResponseBase,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_GET, require_POST
 
 from agents_core.agile_coach import AgileCoachAgent
 from agents_core.product_owner import ProductOwnerAgent
 from aiteam import __version__
-from memory.short_term import ShortTermMemory
+from memory.short_term import get_short_term_memory
 from orchestrator.tasks import run_experts_pipeline, run_retro
 
+try:  # Optional fast JSON codec for request bodies and success payloads
+    import orjson as _orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional speedup
+    _orjson = None  # type: ignore[assignment]
+
 from .serializers import (
     ACFeedbackRequestSerializer,
     AgentThinkRequestSerializer,
@@ -30,23 +46,98 @@ from .serializers import (
 
 # --- Optional API security (token auth + simple rate limiting) ---
 
-_RL_LOCK = threading.Lock()
-_RL_BUCKETS: dict[str, list[float]] = {}
+# Striped buckets: each stripe is an OrderedDict guarded only by its own lock, so a
+# requester's read-modify-write contends with keys on the same stripe and nothing else.
+# Each maps requester id -> (tokens left, monotonic time of the last refill), kept in
+# least-recently-used order. A bucket refills completely within _RL_IDLE_S, so a key
+# idle that long is equivalent to a new one and is swept once a stripe is full.
+_RL_STRIPES = 32
+_RL_LOCKS = tuple(threading.Lock() for _ in range(_RL_STRIPES))
+_RL_BUCKETS: tuple[OrderedDict[str, tuple[float, float]], ...] = tuple(
+    OrderedDict() for _ in range(_RL_STRIPES)
+)
+_RL_STRIPE_MAX = 100_000 // _RL_STRIPES
+_RL_IDLE_S = 60.0
+
+
+def _take_token(key: str, capacity: float, now: float) -> bool:
+    """Refill ``key``'s bucket up to ``now`` and take one token if available."""
+    stripe = hash(key) & (_RL_STRIPES - 1)
+    buckets = _RL_BUCKETS[stripe]
+    rate = capacity / 60.0
+    with _RL_LOCKS[stripe]:
+        tokens, last = buckets.get(key) or (capacity, now)
+        tokens = min(capacity, tokens + (now - last) * rate)
+        allowed = tokens >= 1.0
+        buckets[key] = (tokens - 1.0 if allowed else tokens, now)
+        buckets.move_to_end(key)
+        if len(buckets) > _RL_STRIPE_MAX:
+            _sweep_buckets(buckets, now)
+    return allowed
+
+
+def _sweep_buckets(buckets: OrderedDict[str, tuple[float, float]], now: float) -> None:
+    """Drop idle buckets, oldest first; evict least recently used ones if still full."""
+    while len(buckets) > 1:
+        _key, (_tokens, last) = next(iter(buckets.items()))
+        if now - last < _RL_IDLE_S and len(buckets) <= _RL_STRIPE_MAX:
+            break
+        buckets.popitem(last=False)
+
 
+def _clear_rate_limits() -> None:
+    """Forget every requester's bucket."""
+    for lock, buckets in zip(_RL_LOCKS, _RL_BUCKETS, strict=True):
+        with lock:
+            buckets.clear()
 
-def _auth_enabled() -> bool:
-    return os.getenv("API_ENABLE_AUTH", "0").lower() in {"1", "true", "yes"}
 
+@dataclass(frozen=True, slots=True)
+class _ApiConfig:
+    """Security settings read from the environment once, not per request."""
 
-def _rate_limit_enabled() -> bool:
-    return os.getenv("API_RATE_LIMIT_ENABLED", "0").lower() in {"1", "true", "yes"}
+    auth_enabled: bool
+    api_token: str
+    rate_limit_enabled: bool
+    rate_limit_per_min: int
+    # Any check on; otherwise ``api_guard`` goes straight to the view
+    guard_enabled: bool
+    # Declared request bodies above this size are rejected before being read (0 = no limit)
+    max_body_bytes: int
 
 
-def _rate_limit_per_min() -> int:
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "0").lower() in {"1", "true", "yes"}
+
+
+def _load_api_config() -> _ApiConfig:
+    try:
+        per_min = max(1, int(os.getenv("API_RATE_LIMIT_PER_MIN", "60")))
+    except ValueError:
+        per_min = 60
     try:
-        return max(1, int(os.getenv("API_RATE_LIMIT_PER_MIN", "60")))
+        max_body = max(0, int(os.getenv("API_MAX_BODY_BYTES", "262144")))
     except ValueError:
-        return 60
+        max_body = 262144
+    auth_enabled = _env_flag("API_ENABLE_AUTH")
+    rate_limit_enabled = _env_flag("API_RATE_LIMIT_ENABLED")
+    return _ApiConfig(
+        auth_enabled=auth_enabled,
+        api_token=os.getenv("API_TOKEN", ""),
+        rate_limit_enabled=rate_limit_enabled,
+        rate_limit_per_min=per_min,
+        guard_enabled=auth_enabled or rate_limit_enabled,
+        max_body_bytes=max_body,
+    )
+
+
+_API_CONFIG = _load_api_config()
+
+
+def reload_config() -> None:
+    """Re-read the ``API_*`` security settings from the environment (e.g. in tests)."""
+    global _API_CONFIG  # pylint: disable=global-statement
+    _API_CONFIG = _load_api_config()
 
 
 def _get_token_from_request(request: HttpRequest) -> str:
@@ -60,58 +151,161 @@ def _get_requester_id(request: HttpRequest) -> str:
     return f"ip:{request.META.get('REMOTE_ADDR', 'unknown')}"
 
 
-def api_guard(view: Callable[[HttpRequest], JsonResponse]) -> Callable[[HttpRequest], JsonResponse]:
-    """Decorator adding optional token auth and rate limiting to an API view."""
+def _body_too_large(request: HttpRequest) -> JsonResponse | None:
+    """Return a 413 response when the declared body exceeds ``API_MAX_BODY_BYTES``."""
+    limit = _API_CONFIG.max_body_bytes
+    try:
+        length = int(request.META.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        length = 0
+    if limit and length > limit:
+        return JsonResponse({"errors": {"body": ["Request body too large."]}}, status=413)
+    return None
+
+
+def _guard_rejection(request: HttpRequest) -> JsonResponse | None:
+    """Apply optional token auth and rate limiting; return an error response or None."""
+    config = _API_CONFIG
+    # Token auth (optional)
+    if config.auth_enabled:
+        expected = config.api_token
+        provided = _get_token_from_request(request)
+        # Constant-time comparison so response timing does not leak the token prefix
+        if not expected or not hmac.compare_digest(provided.encode(), expected.encode()):
+            return JsonResponse({"errors": {"auth": ["Unauthorized."]}}, status=401)
+
+    # Rate limiting (optional): token bucket refilling ``per_min`` tokens per minute
+    if config.rate_limit_enabled:
+        key = _get_requester_id(request)
+        allowed = _take_token(key, float(config.rate_limit_per_min), time.monotonic())
+        if not allowed:
+            return JsonResponse({"errors": {"rate": ["Too Many Requests."]}}, status=429)
+    return None
+
+
+def api_guard(view: Callable[..., Any]) -> Callable[..., Any]:
+    """Decorator adding optional token auth and rate limiting to an API view.
+
+    Works for both sync and async (coroutine) views. Bodies declared larger than
+    ``API_MAX_BODY_BYTES`` get a 413 before anything reads them. The settings are
+    consulted per request (so ``reload_config()`` takes effect), but with auth and
+    rate limiting disabled those checks cost a single attribute read.
+    """
+    if asyncio.iscoroutinefunction(view):
+
+        @wraps(view)
+        async def _awrapped(request: HttpRequest, *args: Any, **kwargs: Any) -> JsonResponse:
+            rejection = _body_too_large(request)
+            if rejection is None and _API_CONFIG.guard_enabled:
+                rejection = _guard_rejection(request)
+            if rejection is not None:
+                return rejection
+            return await view(request, *args, **kwargs)
+
+        return _awrapped
 
     @wraps(view)
-    def _wrapped(
-        request: HttpRequest, *args: Any, **kwargs: Any
-    ) -> JsonResponse:  # type: ignore[override]
-        # Token auth (optional)
-        if _auth_enabled():
-            expected = os.getenv("API_TOKEN", "")
-            provided = _get_token_from_request(request)
-            if not expected or provided != expected:
-                return JsonResponse({"errors": {"auth": ["Unauthorized."]}}, status=401)
-
-        # Rate limiting (optional)
-        if _rate_limit_enabled():
-            key = _get_requester_id(request)
-            now = time.time()
-            window = 60.0
-            with _RL_LOCK:
-                bucket = _RL_BUCKETS.setdefault(key, [])
-                # prune
-                cutoff = now - window
-                prune_count = next(
-                    (idx for idx, ts in enumerate(bucket) if ts >= cutoff), len(bucket)
-                )
-                if prune_count:
-                    del bucket[:prune_count]
-                if len(bucket) >= _rate_limit_per_min():
-                    return JsonResponse({"errors": {"rate": ["Too Many Requests."]}}, status=429)
-                bucket.append(now)
-
+    def _wrapped(request: HttpRequest, *args: Any, **kwargs: Any) -> JsonResponse:
+        rejection = _body_too_large(request)
+        if rejection is None and _API_CONFIG.guard_enabled:
+            rejection = _guard_rejection(request)
+        if rejection is not None:
+            return rejection
         return view(request, *args, **kwargs)
 
     return _wrapped
 
 
-def health(request: HttpRequest) -> JsonResponse:
+# request -> decoded JSON body; weak keys so entries vanish with their request
+_PARSED_BODIES: weakref.WeakKeyDictionary[HttpRequest, Any] = weakref.WeakKeyDictionary()
+_UNPARSED = object()
+
+
+def _parse_body(request: HttpRequest) -> Any:
+    """Decode the JSON request body straight from bytes; an empty body is ``{}``.
+
+    The result is memoized per request, so repeat calls (e.g. from a decorator
+    and the view) parse only once. Raises ``ValueError``
+    (``json.JSONDecodeError``/``orjson.JSONDecodeError`` or a UTF-8 decoding
+    error) for malformed input.
+    """
+    cached = _PARSED_BODIES.get(request, _UNPARSED)
+    if cached is not _UNPARSED:
+        return cached
+    body = request.body
+    if not body:
+        data: Any = {}
+    else:
+        data = _orjson.loads(body) if _orjson is not None else json.loads(body)
+    _PARSED_BODIES[request] = data
+    return data
+
+
+_TRUTHY = frozenset({"1", "true", "yes", "on"})
+
+
+def _query_flag(request: HttpRequest, key: str) -> bool:
+    """Return whether query parameter ``key`` is truthy (``1``/``true``/``yes``/``on``)."""
+    return request.GET.get(key, "0").strip().lower() in _TRUTHY
+
+
+def _invalid_json() -> JsonResponse:
+    return JsonResponse({"errors": {"non_field_errors": ["Invalid JSON body."]}}, status=400)
+
+
+class _EncodedJsonResponse(HttpResponse):
+    """``application/json`` response around a body that is already encoded."""
+
+    def __init__(self, content: bytes, **kwargs: Any) -> None:
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content, **kwargs)
+
+
+def _json(payload: dict[str, Any], status: int = 200) -> HttpResponse:
+    """Serialize a success payload with orjson when available.
+
+    Falls back to ``JsonResponse`` (``DjangoJSONEncoder``) without orjson or for
+    values orjson rejects (e.g. Decimal, lazy translation strings).
+    """
+    if _orjson is not None:
+        with contextlib.suppress(TypeError):
+            return _EncodedJsonResponse(_orjson.dumps(payload), status=status)
+    return JsonResponse(payload, status=status)
+
+
+@lru_cache(maxsize=1)
+def _po() -> ProductOwnerAgent:
+    """Process-wide Product Owner; agents keep no per-request state."""
+    return ProductOwnerAgent(name="po", role="Product Owner", memory=get_short_term_memory())
+
+
+@lru_cache(maxsize=1)
+def _ac() -> AgileCoachAgent:
+    """Process-wide Agile Coach; agents keep no per-request state."""
+    return AgileCoachAgent(name="ac", role="Agile Coach", memory=get_short_term_memory())
+
+
+# Constant bodies serialized once; responses are still fresh per request since Django
+# mutates them (headers, cookies) on the way out
+_HEALTH_BODY = b'{"status":"ok"}'
+_VERSION_BODY = json.dumps({"version": str(__version__)}, separators=(",", ":")).encode()
+
+
+def health(request: HttpRequest) -> HttpResponse:
     """Simple health endpoint for readiness/liveness checks."""
-    return JsonResponse({"status": "ok"})
+    return _EncodedJsonResponse(_HEALTH_BODY)
 
 
 @require_GET
 @api_guard
-def version(request: HttpRequest) -> JsonResponse:
+def version(request: HttpRequest) -> HttpResponse:
     """Return application version."""
-    return JsonResponse({"version": str(__version__)})
+    return _EncodedJsonResponse(_VERSION_BODY)
 
 
 @require_GET
 @api_guard
-def memory_history(request: HttpRequest, agent: str) -> JsonResponse:
+def memory_history(request: HttpRequest, agent: str) -> HttpResponse:
     """Return short-term memory history for ``agent``.
 
     Query parameters:
@@ -122,117 +316,136 @@ def memory_history(request: HttpRequest, agent: str) -> JsonResponse:
     except (TypeError, ValueError):
         limit = 20
     limit = max(1, min(100, limit))
-    stm = ShortTermMemory()
+    stm = get_short_term_memory()
     items = stm.history(agent, limit=limit)
-    return JsonResponse({"agent": agent, "limit": limit, "items": items})
+    return _json({"agent": agent, "limit": limit, "items": items})
 
 
 @csrf_exempt
 @require_POST
 @api_guard
-def memory_append(request: HttpRequest, agent: str) -> JsonResponse:
-    """Append an item to short-term memory for an agent.
+def memory_append(request: HttpRequest, agent: str) -> HttpResponse:
+    """Append an item (or several, in one write) to short-term memory for an agent.
 
     Body JSON:
-        {"item": "<text>"}
+        {"item": "<text>"} or {"items": ["<text>", ...]}
     """
     try:
-        data = json.loads(request.body.decode() or "{}")
-    except json.JSONDecodeError:
-        return JsonResponse({"errors": {"non_field_errors": ["Invalid JSON body."]}}, status=400)
+        data = _parse_body(request)
+    except ValueError:
+        return _invalid_json()
 
     ser = MemoryAppendSerializer(data=data)
     if not ser.is_valid():
         return JsonResponse({"errors": ser.errors}, status=400)
 
-    stm = ShortTermMemory()
+    stm = get_short_term_memory()
+    if "items" in ser.validated_data:
+        items = ser.validated_data["items"]
+        stm.append_many(agent, items)
+        return _json({"agent": agent, "items": items}, status=201)
     item = ser.validated_data["item"]
     stm.append(agent, item)
-    return JsonResponse({"agent": agent, "item": item}, status=201)
+    return _json({"agent": agent, "item": item}, status=201)
+
+
+async def _sse_tasks(agent: ProductOwnerAgent, description: str) -> AsyncIterator[str]:
+    """Render streamed planning tasks as Server-Sent Events."""
+    count = 0
+    async for task in agent.stream_tasks(description):
+        count += 1
+        yield f"event: task\ndata: {json.dumps({'task': task})}\n\n"
+    yield f"event: done\ndata: {json.dumps({'count': count})}\n\n"
 
 
 @csrf_exempt
 @require_POST
 @api_guard
-def plan(request: HttpRequest) -> JsonResponse:
+async def plan(request: HttpRequest) -> HttpResponseBase:
     """Return a simple plan from the ProductOwnerAgent.
 
+    Async view: the LLM call is awaited, so a slow model does not hold a worker.
+    With ``Accept: text/event-stream`` the tasks are streamed as Server-Sent Events
+    (one ``task`` event per task as soon as it is parsed, then a ``done`` event
+    with the count).
+
     Body JSON:
         {"description": "<text>"}
     """
     try:
-        data = json.loads(request.body.decode() or "{}")
-    except json.JSONDecodeError:
-        return JsonResponse({"errors": {"non_field_errors": ["Invalid JSON body."]}}, status=400)
+        data = _parse_body(request)
+    except ValueError:
+        return _invalid_json()
 
     ser = PlanRequestSerializer(data=data)
     if not ser.is_valid():
         return JsonResponse({"errors": ser.errors}, status=400)
 
-    stm = ShortTermMemory()
-    agent = ProductOwnerAgent(name="po", role="Product Owner", memory=stm)
-    debug_flag = str(request.GET.get("debug", "0")).strip().lower() in {"1", "true", "yes", "on"}
+    agent = _po()
+    if "text/event-stream" in request.headers.get("Accept", ""):
+        response = StreamingHttpResponse(
+            _sse_tasks(agent, ser.validated_data["description"]),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        return response
+    debug_flag = _query_flag(request, "debug")
     if debug_flag:
-        tasks, dbg = agent.plan_work_debug(ser.validated_data["description"])
-        return JsonResponse({"tasks": tasks, "count": len(tasks), "_debug": dbg})
-    tasks = agent.plan_work(ser.validated_data["description"])
-    return JsonResponse({"tasks": tasks, "count": len(tasks)})
+        tasks, dbg = await agent.aplan_work_debug(ser.validated_data["description"])
+        return _json({"tasks": tasks, "count": len(tasks), "_debug": dbg})
+    tasks = await agent.aplan_work(ser.validated_data["description"])
+    return _json({"tasks": tasks, "count": len(tasks)})
 
 
 @csrf_exempt
 @require_POST
 @api_guard
-def ac_feedback(request: HttpRequest) -> JsonResponse:
+def ac_feedback(request: HttpRequest) -> HttpResponse:
     """Return feedback from the AgileCoachAgent for a list of tasks.
 
     Body JSON:
         {"tasks": ["..."]}
     """
     try:
-        data = json.loads(request.body.decode() or "{}")
-    except json.JSONDecodeError:
-        return JsonResponse({"errors": {"non_field_errors": ["Invalid JSON body."]}}, status=400)
+        data = _parse_body(request)
+    except ValueError:
+        return _invalid_json()
 
     ser = ACFeedbackRequestSerializer(data=data)
     if not ser.is_valid():
         return JsonResponse({"errors": ser.errors}, status=400)
 
-    stm = ShortTermMemory()
-    feedback = AgileCoachAgent(name="ac", role="Agile Coach", memory=stm).feedback_on_plan(
-        ser.validated_data["tasks"]
-    )
-    return JsonResponse({"feedback": feedback})
+    feedback = _ac().feedback_on_plan(ser.validated_data["tasks"])
+    return _json({"feedback": feedback})
 
 
 @csrf_exempt
 @require_POST
 @api_guard
-def agent_think(request: HttpRequest) -> JsonResponse:
+def agent_think(request: HttpRequest) -> HttpResponse:
     """Have a core agent generate a thought for a goal and record it.
 
     Body JSON:
         {"agent": "po"|"ac", "goal": "<text>"}
     """
     try:
-        data = json.loads(request.body.decode() or "{}")
-    except json.JSONDecodeError:
-        return JsonResponse({"errors": {"non_field_errors": ["Invalid JSON body."]}}, status=400)
+        data = _parse_body(request)
+    except ValueError:
+        return _invalid_json()
 
     ser = AgentThinkRequestSerializer(data=data)
     if not ser.is_valid():
         return JsonResponse({"errors": ser.errors}, status=400)
 
-    stm = ShortTermMemory()
-    if ser.validated_data["agent"] == "po":
-        agent = ProductOwnerAgent(name="po", role="Product Owner", memory=stm)
-    else:
-        agent = AgileCoachAgent(name="ac", role="Agile Coach", memory=stm)
-    debug_flag = str(request.GET.get("debug", "0")).strip().lower() in {"1", "true", "yes", "on"}
+    agent: ProductOwnerAgent | AgileCoachAgent = (
+        _po() if ser.validated_data["agent"] == "po" else _ac()
+    )
+    debug_flag = _query_flag(request, "debug")
     if debug_flag and hasattr(agent, "think_debug"):
         thought, dbg = agent.think_debug(ser.validated_data["goal"])  # type: ignore[attr-defined]
-        return JsonResponse({"thought": thought, "_debug": dbg})
+        return _json({"thought": thought, "_debug": dbg})
     thought = agent.think(ser.validated_data["goal"])
-    return JsonResponse({"thought": thought})
+    return _json({"thought": thought})
 
 
 @csrf_exempt
@@ -263,7 +476,7 @@ def retro_run(request: HttpRequest) -> JsonResponse:
 @csrf_exempt
 @require_POST
 @api_guard
-def experts_run(request: HttpRequest) -> JsonResponse:
+def experts_run(request: HttpRequest) -> HttpResponse:
     """Run the orchestrator-driven experts pipeline.
 
     Body JSON:
@@ -274,16 +487,16 @@ def experts_run(request: HttpRequest) -> JsonResponse:
         async: If truthy, attempt async scheduling; fallback to sync apply.
     """
     try:
-        data = json.loads(request.body.decode() or "{}")
-    except json.JSONDecodeError:
-        return JsonResponse({"errors": {"non_field_errors": ["Invalid JSON body."]}}, status=400)
+        data = _parse_body(request)
+    except ValueError:
+        return _invalid_json()
 
     ser = PlanRequestSerializer(data=data)
     if not ser.is_valid():
         return JsonResponse({"errors": ser.errors}, status=400)
 
-    debug_flag = str(request.GET.get("debug", "0")).strip().lower() in {"1", "true", "yes", "on"}
-    async_flag = str(request.GET.get("async", "0")).strip().lower() in {"1", "true", "yes", "on"}
+    debug_flag = _query_flag(request, "debug")
+    async_flag = _query_flag(request, "async")
 
     description = ser.validated_data["description"]
 
@@ -304,4 +517,4 @@ def experts_run(request: HttpRequest) -> JsonResponse:
         return JsonResponse(
             {"errors": {"non_field_errors": ["Pipeline execution failed."]}}, status=500
         )
-    return JsonResponse(result)
+    return _json(result)
@@ -11,6 +11,7 @@ from __future__ import annotations
 
 import asyncio
 import os
+from functools import lru_cache
 
 import structlog
 from celery import group
@@ -19,16 +20,29 @@ from channels.generic.websocket import AsyncJsonWebsocketConsumer
 from agents_core.agile_coach import AgileCoachAgent
 from agents_core.dynamic_expert import (
     DynamicExpertAgent,
+    ExpertSpec,
     create_agents,
     select_experts_from_tasks,
 )
 from agents_core.product_owner import ProductOwnerAgent
-from memory.short_term import ShortTermMemory
+from memory.short_term import ShortTermMemory, get_short_term_memory
 from orchestrator.tasks import expert_prepare
 
 logger = structlog.get_logger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _po() -> ProductOwnerAgent:
+    """Process-wide Product Owner; agents keep no per-message state."""
+    return ProductOwnerAgent(name="po", role="Product Owner", memory=get_short_term_memory())
+
+
+@lru_cache(maxsize=1)
+def _ac() -> AgileCoachAgent:
+    """Process-wide Agile Coach; agents keep no per-message state."""
+    return AgileCoachAgent(name="ac", role="Agile Coach", memory=get_short_term_memory())
+
+
 class ChatConsumer(AsyncJsonWebsocketConsumer):
     """Channels JSON consumer for chat messages."""
 
@@ -37,14 +51,11 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
         await self.accept()
         await self.send_json({"type": "system", "message": "Connected to AITEAM chat."})
 
-    async def _plan_and_stream(self, stm: ShortTermMemory, user_msg: str) -> list[str]:
+    async def _plan_and_stream(self, user_msg: str) -> list[str]:
         """Plan with `ProductOwnerAgent` and stream progress and final result."""
         await self.send_json({"type": "po_plan_start", "message": "Planning started."})
-        po_tasks: list[str] = ProductOwnerAgent(
-            name="po", role="Product Owner", memory=stm
-        ).plan_work(str(user_msg))
+        po_tasks: list[str] = await _po().aplan_work(str(user_msg))
         for idx, task in enumerate(po_tasks, start=1):
-            await asyncio.sleep(0.1)
             await self.send_json({"type": "po_plan_step", "index": idx, "task": task})
         await self.send_json(
             {
@@ -56,12 +67,17 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
         logger.info("chat.sent_plan", tasks=len(po_tasks))
         return po_tasks
 
+    async def _send_feedback(self, po_tasks: list[str]) -> None:
+        """Send Agile Coach feedback on the plan."""
+        feedback = await asyncio.to_thread(_ac().feedback_on_plan, po_tasks)
+        await self.send_json({"type": "ac_feedback", "message": feedback})
+        logger.info("chat.sent_ac_feedback")
+
     async def _select_and_prepare_experts(
         self, stm: ShortTermMemory, po_tasks: list[str], user_msg: str
     ) -> None:
         """Select experts and stream preparation concurrently."""
-        await asyncio.sleep(0.1)
-        specs, dbg = select_experts_from_tasks(po_tasks)
+        specs, dbg = await asyncio.to_thread(select_experts_from_tasks, po_tasks)
         expert_names = [s.expertise for s in specs]
         await self.send_json(
             {
@@ -97,7 +113,6 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
             prepared: list[str] = []
             for item in results:
                 prepared.append(item["expert"])
-                await asyncio.sleep(0.05)
                 await self.send_json(
                     {
                         "type": "expert_update",
@@ -105,26 +120,33 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
                         "message": item["message"],
                     }
                 )
-            await asyncio.sleep(0.1)
             await self.send_json(
                 {"type": "expert_update", "message": "Experts prepared.", "experts": prepared}
             )
             logger.info("chat.sent_expert_updates", experts=len(prepared))
             return
-        agents: list[DynamicExpertAgent] = create_agents(specs, memory=stm)
+        await self._prepare_in_process(stm, specs, user_msg)
+
+    async def _prepare_in_process(
+        self, stm: ShortTermMemory, specs: list[ExpertSpec], user_msg: str
+    ) -> None:
+        """Prepare experts in this process, streaming each result as it completes."""
+        # Agents get no memory: their observations are collected and written in one batch
+        agents: list[DynamicExpertAgent] = create_agents(specs)
         prepared: list[str] = []
+        observations: list[tuple[str, str]] = []
 
         async def _prepare_and_stream(agent: DynamicExpertAgent) -> None:
-            result = agent.solve(f"Prepare for: {user_msg}")
+            result = await asyncio.to_thread(agent.solve, f"Prepare for: {user_msg}")
             prepared.append(agent.expertise)
-            await asyncio.sleep(0.05)
+            observations.append((agent.name, result))
             await self.send_json(
                 {"type": "expert_update", "expert": agent.expertise, "message": result}
             )
 
         jobs = [asyncio.create_task(_prepare_and_stream(a)) for a in agents]
         await asyncio.gather(*jobs)
-        await asyncio.sleep(0.1)
+        await asyncio.to_thread(stm.append_batch, observations)
         await self.send_json(
             {"type": "expert_update", "message": "Experts prepared.", "experts": prepared}
         )
@@ -133,20 +155,20 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
     async def receive_json(self, content: dict, **_kwargs) -> None:  # type: ignore[override]
         """Handle an incoming JSON payload from the client."""
         user_msg = content.get("message")
-        logger.info("chat.receive", message=user_msg)
+        # Log the size, not the text: messages are unbounded user content
+        logger.info("chat.receive", chars=len(user_msg) if isinstance(user_msg, str) else None)
         if not user_msg:
             await self.send_json({"type": "error", "message": "Missing 'message' in payload."})
             return
 
-        stm = ShortTermMemory()
-        po_tasks = await self._plan_and_stream(stm, str(user_msg))
-        feedback = AgileCoachAgent(name="ac", role="Agile Coach", memory=stm).feedback_on_plan(
-            po_tasks
+        stm = get_short_term_memory()
+        po_tasks = await self._plan_and_stream(str(user_msg))
+        # Feedback and expert selection depend only on the plan: run both branches
+        # concurrently, each streaming its events as soon as they are ready
+        await asyncio.gather(
+            self._send_feedback(po_tasks),
+            self._select_and_prepare_experts(stm, po_tasks, str(user_msg)),
         )
-        await asyncio.sleep(0.1)
-        await self.send_json({"type": "ac_feedback", "message": feedback})
-        logger.info("chat.sent_ac_feedback")
-        await self._select_and_prepare_experts(stm, po_tasks, str(user_msg))
 
     async def disconnect(self, code: int) -> None:  # pragma: no cover - event callback
         """Log disconnect events."""
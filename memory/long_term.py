@@ -1,22 +1,29 @@
 """Long-term knowledge graph storage using Neo4j (optional dependency).
 
 Provides a minimal interface to upsert notes linked to agents. The module
-gracefully degrades when the Neo4j driver is unavailable.
+gracefully degrades when the Neo4j driver is unavailable. Use
+``get_knowledge_graph()`` to share one driver (and its connection pool) per
+process instead of constructing ``KnowledgeGraph`` per call, and
+``enqueue_note()`` to persist advisory notes from a background writer thread
+that batches them into a single ``UNWIND`` write.
 """
 
 from __future__ import annotations
 
+import atexit
+import contextlib
+import functools
 import os
+import queue
+import threading
+import time
+from collections.abc import Iterable
 
 try:
     from neo4j import GraphDatabase as _GraphDatabase  # type: ignore
-    from neo4j.exceptions import Neo4jError as _Neo4jError  # type: ignore
 except ImportError:  # pragma: no cover - optional
     _GraphDatabase = None  # type: ignore
 
-    class _Neo4jError(Exception):  # type: ignore
-        """Fallback Neo4j error when driver is not installed."""
-
 
 class KnowledgeGraph:
     """Neo4j-backed knowledge graph (minimal stub)."""
@@ -31,9 +38,22 @@ class KnowledgeGraph:
         if uri and user and pwd:
             try:
                 self._driver = _GraphDatabase.driver(uri, auth=(user, pwd))
-            except _Neo4jError:  # pragma: no cover - fallback when not available
+            # Any init failure (bad URI, config error) leaves the graph disabled
+            except Exception:  # pragma: no cover  # pylint: disable=broad-exception-caught
                 self._driver = None
 
+    def close(self) -> None:
+        """Close the driver and its connection pool; the graph is disabled afterwards."""
+        driver, self._driver = self._driver, None
+        if driver is not None:  # pragma: no cover - requires neo4j
+            with contextlib.suppress(Exception):
+                driver.close()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether a Neo4j driver is configured (writes are no-ops otherwise)."""
+        return self._driver is not None
+
     def upsert_note(self, agent: str, text: str) -> None:
         """Create a note and link it to an agent node if a driver is set."""
         if not self._driver:  # pragma: no cover - noop in dev without neo4j
@@ -41,3 +61,111 @@ class KnowledgeGraph:
         query = "MERGE (a:Agent {name:$agent}) CREATE (a)-[:NOTED]->(:Note {text:$text})"
         with self._driver.session() as session:
             session.run(query, agent=agent, text=text)
+
+    def upsert_notes(self, notes: Iterable[tuple[str, str]]) -> None:
+        """Create several ``(agent, text)`` notes in one round-trip if a driver is set."""
+        if not self._driver:  # pragma: no cover - noop in dev without neo4j
+            return
+        rows = [{"agent": agent, "text": text} for agent, text in notes]
+        if not rows:
+            return
+        query = (
+            "UNWIND $rows AS r MERGE (a:Agent {name:r.agent}) "
+            "CREATE (a)-[:NOTED]->(:Note {text:r.text})"
+        )
+        with self._driver.session() as session:
+            session.run(query, rows=rows)
+
+
+@functools.lru_cache(maxsize=1)
+def get_knowledge_graph() -> KnowledgeGraph:
+    """Return the process-wide KnowledgeGraph, creating its driver on first use.
+
+    A failed driver init is remembered too (the instance stays disabled), so the
+    Bolt handshake is attempted at most once per process.
+    """
+    return KnowledgeGraph()
+
+
+# --- Background note persistence ---
+
+_NOTE_QUEUE: queue.Queue[tuple[str, str]] = queue.Queue(maxsize=10_000)
+_NOTE_BATCH_SIZE = 100
+_NOTE_LINGER_S = 0.2
+_WRITER_LOCK = threading.Lock()
+_WRITER: threading.Thread | None = None
+
+
+def enqueue_note(agent: str, text: str) -> None:
+    """Queue a note for asynchronous persistence and return immediately.
+
+    Notes are advisory: nothing is queued when Neo4j is not configured, and
+    notes are dropped rather than blocking the caller if the queue is full.
+    """
+    if not get_knowledge_graph().enabled:
+        return
+    _ensure_writer()
+    with contextlib.suppress(queue.Full):  # drop on back-pressure
+        _NOTE_QUEUE.put_nowait((agent, text))
+
+
+def flush_notes(timeout: float = 5.0) -> bool:
+    """Wait up to ``timeout`` seconds for queued notes to be written.
+
+    Returns True when the queue drained in time.
+    """
+    deadline = time.monotonic() + timeout
+    while _NOTE_QUEUE.unfinished_tasks:
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def _ensure_writer() -> None:
+    global _WRITER  # pylint: disable=global-statement
+    if _WRITER is not None and _WRITER.is_alive():
+        return
+    with _WRITER_LOCK:
+        if _WRITER is None or not _WRITER.is_alive():
+            _WRITER = threading.Thread(target=_note_writer, name="kg-note-writer", daemon=True)
+            _WRITER.start()
+
+
+def _drain_batch() -> list[tuple[str, str]]:
+    """Block for one note, then collect more until the batch is full or linger expires."""
+    batch = [_NOTE_QUEUE.get()]
+    deadline = time.monotonic() + _NOTE_LINGER_S
+    while len(batch) < _NOTE_BATCH_SIZE:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(_NOTE_QUEUE.get(timeout=remaining))
+        except queue.Empty:
+            break
+    return batch
+
+
+def _note_writer() -> None:
+    while True:
+        batch = _drain_batch()
+        try:
+            get_knowledge_graph().upsert_notes(batch)
+        except Exception:  # pragma: no cover - defensive  # pylint: disable=broad-exception-caught
+            pass
+        finally:
+            for _ in batch:
+                _NOTE_QUEUE.task_done()
+
+
+def _shutdown() -> None:
+    """Drain queued notes, then close the shared driver's connection pool."""
+    flush_notes()
+    # Only close a graph that exists: calling get_knowledge_graph() here would open a
+    # driver at exit. pylint misreads the lru_cache wrapper's zero-arg cache_info().
+    if get_knowledge_graph.cache_info().currsize:  # pylint: disable=too-many-function-args
+        get_knowledge_graph().close()
+
+
+atexit.register(_shutdown)
@@ -2,13 +2,29 @@
 
 This module provides a minimal wrapper that appends text items per agent and
 retrieves recent history. Redis is used when available via ``REDIS_URL``; the
-fallback is an in-memory dictionary suitable for tests and local dev.
+fallback is an in-memory dictionary suitable for tests and local dev. Use
+``get_short_term_memory()`` to share one instance (and its Redis connection
+pool) per process instead of connecting and pinging on every request. With
+``STM_ASYNC_WRITES=1``, Redis appends are queued and written by a background
+thread in pipelined batches; a read waits only for queued writes to the agent it
+reads, and ``flush()`` waits for all of them.
 """
 
 from __future__ import annotations
 
+import contextlib
+import functools
+import itertools
 import os
-from collections import defaultdict
+import queue
+import threading
+import time
+from collections import defaultdict, deque
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
 
 try:  # Optional dependency; keep imports local and typed
     import redis as _redis  # type: ignore
@@ -20,36 +36,275 @@ except ImportError:  # pragma: no cover - optional dependency fallback
         """Fallback Redis error type when redis is not installed."""
 
 
-_STORE: defaultdict[str, list[str]] = defaultdict(list)
+logger = structlog.get_logger(__name__)
+
+# Only the most recent items are ever read, so per-agent history is capped: O(1) deque
+# eviction in memory, LTRIM after every RPUSH in Redis
+STM_MAX = max(1, int(os.getenv("STM_MAX", "1000")))
+
+# STM_ASYNC_WRITES=1 makes Redis appends a non-blocking enqueue; a per-instance daemon
+# thread sends them in pipelined batches (up to 128 items, 5 ms linger) and a read waits
+# for the queued writes of its own agent first. Off by default: a crashed process loses
+# unsent items.
+_ASYNC_WRITES = os.getenv("STM_ASYNC_WRITES", "0").strip().lower() in {"1", "true", "yes", "on"}
+_QUEUE_MAX = 10_000
+_WRITE_BATCH = 128
+_WRITE_LINGER_S = 0.005
+
+_STORE: defaultdict[str, deque[str]] = defaultdict(lambda: deque(maxlen=STM_MAX))
+
+
+@functools.lru_cache(maxsize=1024)
+def _key(agent: str) -> bytes:
+    """Redis list key for ``agent``, pre-encoded so redis-py passes it through as is."""
+    return f"stm:{agent}".encode()
+
+
+# Per-URL Redis clients, and when each unreachable URL last failed: a failure is
+# remembered for _REDIS_RETRY_S so instances do not each stall on a dead server, then
+# the next instance tries again
+_REDIS_RETRY_S = 30.0
+_REDIS_CLIENTS: dict[str, Any] = {}
+_REDIS_FAILED_AT: dict[str, float] = {}
+_REDIS_LOCK = threading.Lock()
+
+
+def _redis_client(url: str) -> Any:
+    """Return a shared, pinged Redis client for ``url``, or None if unreachable.
+
+    Cached per URL so every ``ShortTermMemory`` (and Celery task) reuses one
+    connection pool instead of reconnecting and pinging. An unreachable server
+    yields None without a new attempt until ``_REDIS_RETRY_S`` seconds passed.
+    """
+    client = _REDIS_CLIENTS.get(url)
+    if client is not None:
+        return client
+    with _REDIS_LOCK:
+        client = _REDIS_CLIENTS.get(url)
+        if client is not None:
+            return client
+        failed_at = _REDIS_FAILED_AT.get(url)
+        if failed_at is not None and time.monotonic() - failed_at < _REDIS_RETRY_S:
+            return None
+        try:
+            client = _redis.Redis.from_url(url, decode_responses=True, health_check_interval=30)
+            client.ping()
+        except _RedisError:
+            _REDIS_FAILED_AT[url] = time.monotonic()
+            return None
+        _REDIS_FAILED_AT.pop(url, None)
+        _REDIS_CLIENTS[url] = client
+        return client
+
+
+@dataclass(slots=True)
+class _WriteQueue:
+    """State of a ``ShortTermMemory``'s background writer (see ``STM_ASYNC_WRITES``)."""
+
+    items: queue.Queue[tuple[str, tuple[str, ...]]] = field(
+        default_factory=lambda: queue.Queue(maxsize=_QUEUE_MAX)
+    )
+    # agent -> queued writes not yet sent; reads fence on their own agent only
+    pending: dict[str, int] = field(default_factory=dict)
+    # Guards ``pending`` and writer start-up; notified after every sent batch
+    cond: threading.Condition = field(default_factory=threading.Condition)
+    thread: threading.Thread | None = None
+    # Queued appends Redis rejected since the last ``flush()``
+    lost: int = 0
 
 
 class ShortTermMemory:
     """Short-term memory backed by Redis if available, else in-memory."""
 
     def __init__(self) -> None:
-        self._client = None
+        # Per-thread pipeline buffering writes inside ``batch()``; the instance is shared
+        self._local = threading.local()
         url = os.getenv("REDIS_URL")
-        if _redis and url:
-            try:
-                self._client = _redis.Redis.from_url(url, decode_responses=True)
-                # quick ping
-                self._client.ping()
-            except _RedisError:  # pragma: no cover - fallback path
-                self._client = None
+        self._client = _redis_client(url) if _redis and url else None
         if self._client is None:
             # Use a shared in-memory store across instances for dev/tests
             self._store = _STORE
+        # Opt-in background writer (see _enqueue); only meaningful with Redis
+        self._async_writes = self._client is not None and _ASYNC_WRITES
+        self._writes = _WriteQueue()
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[None]:
+        """Buffer this thread's Redis writes and send them in one round-trip on exit.
+
+        Nested ``batch()`` blocks join the outermost one. Reads inside the block do
+        not see buffered writes yet. A no-op for the in-memory store.
+        """
+        if self._client is None or getattr(self._local, "pipe", None) is not None:
+            yield
+            return
+        self._local.pipe = self._client.pipeline(transaction=False)
+        try:
+            yield
+            self._local.pipe.execute()
+        finally:
+            self._local.pipe = None
+
+    def _queued_writes(self) -> bool:
+        """Whether writes go to the background writer (enabled and not inside ``batch()``)."""
+        return self._async_writes and getattr(self._local, "pipe", None) is None
+
+    def _enqueue(self, agent: str, items: tuple[str, ...]) -> bool:
+        """Hand ``items`` to the background writer; False when its queue is full."""
+        writes = self._writes
+        self._ensure_writer()
+        with writes.cond:
+            try:
+                writes.items.put_nowait((agent, items))
+            except queue.Full:  # back-pressure: the caller writes synchronously instead
+                return False
+            writes.pending[agent] = writes.pending.get(agent, 0) + 1
+        return True
+
+    def _ensure_writer(self) -> None:
+        writes = self._writes
+        if writes.thread is not None and writes.thread.is_alive():
+            return
+        with writes.cond:
+            if writes.thread is None or not writes.thread.is_alive():
+                writes.thread = threading.Thread(
+                    target=self._write_queued, name="stm-writer", daemon=True
+                )
+                writes.thread.start()
+
+    def _write_queued(self) -> None:
+        """Writer loop: drain queued appends and send each batch as one pipeline."""
+        writes = self._writes
+        while True:
+            batch = [writes.items.get()]
+            deadline = time.monotonic() + _WRITE_LINGER_S
+            while len(batch) < _WRITE_BATCH:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(writes.items.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                with self.batch():
+                    for agent, items in batch:
+                        self._push(agent, items)
+            except _RedisError as exc:  # background writes are best-effort, but not silent
+                logger.warning(
+                    "stm.write_failed",
+                    appends=len(batch),
+                    agents=sorted({agent for agent, _items in batch}),
+                    error=str(exc),
+                )
+                with writes.cond:
+                    writes.lost += len(batch)
+            finally:
+                with writes.cond:
+                    for agent, _items in batch:
+                        left = writes.pending[agent] - 1
+                        if left:
+                            writes.pending[agent] = left
+                        else:
+                            del writes.pending[agent]
+                    writes.cond.notify_all()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait up to ``timeout`` seconds for queued background writes to reach Redis.
+
+        Returns True when the queue drained in time and no queued append was lost to
+        a Redis error since the previous ``flush()`` (always, without async writes).
+        """
+        writes = self._writes
+        with writes.cond:
+            drained = writes.cond.wait_for(lambda: not writes.pending, timeout)
+            lost, writes.lost = writes.lost, 0
+        return drained and not lost
+
+    def _await_writes(self, agent: str, timeout: float = 5.0) -> None:
+        """Wait up to ``timeout`` seconds for ``agent``'s queued writes (not everyone's)."""
+        pending = self._writes.pending
+        if not self._async_writes or agent not in pending:
+            return
+        with self._writes.cond:
+            self._writes.cond.wait_for(lambda: agent not in pending, timeout)
+
+    def _push(self, agent: str, items: Sequence[str]) -> None:
+        """RPUSH ``items`` and LTRIM the list to ``STM_MAX`` in one pipelined round-trip."""
+        if self._queued_writes():
+            if self._enqueue(agent, tuple(items)):
+                return
+            # Queue full: let this agent's older queued items land first to keep order
+            self._await_writes(agent)
+        key = _key(agent)
+        with self.batch():
+            pipe = self._local.pipe
+            pipe.rpush(key, *items)
+            pipe.ltrim(key, -STM_MAX, -1)
 
     def append(self, agent: str, item: str) -> None:
         """Append an item to the agent's short-term memory."""
         if self._client is not None:
-            self._client.rpush(f"stm:{agent}", item)
+            self._push(agent, (item,))
         else:
             self._store[agent].append(item)
 
+    def append_many(self, agent: str, items: Sequence[str]) -> None:
+        """Append several items for ``agent`` in order with one Redis round-trip."""
+        if not items:
+            return
+        if self._client is not None:
+            self._push(agent, items)
+        else:
+            self._store[agent].extend(items)
+
+    def append_batch(self, entries: Iterable[tuple[str, str]]) -> None:
+        """Append ``(agent, item)`` pairs, possibly for many agents, in one round-trip."""
+        if self._client is not None:
+            if self._queued_writes():
+                for agent, item in entries:
+                    self._push(agent, (item,))
+                return
+            with self.batch():
+                for agent, item in entries:
+                    self._push(agent, (item,))
+        else:
+            for agent, item in entries:
+                self._store[agent].append(item)
+
     def history(self, agent: str, limit: int = 20) -> list[str]:
         """Return up to ``limit`` most recent items for ``agent``."""
         if self._client is not None:
-            data = self._client.lrange(f"stm:{agent}", -limit, -1)
-            return list(data)
-        return self._store[agent][-limit:]
+            self._await_writes(agent)
+            # LRANGE already replies with a fresh list of decoded strings
+            return self._client.lrange(_key(agent), -limit, -1)
+        # Walk back from the newest item: O(limit), where a forward islice is O(len)
+        return list(itertools.islice(reversed(self._store[agent]), max(0, limit)))[::-1]
+
+    def last(self, agent: str) -> str:
+        """Return the most recent item for ``agent``, or "" if there is none (LINDEX)."""
+        if self._client is not None:
+            self._await_writes(agent)
+            return self._client.lindex(_key(agent), -1) or ""
+        items = self._store.get(agent)
+        return items[-1] if items else ""
+
+    def count(self, agent: str, limit: int | None = None) -> int:
+        """Return how many items ``agent`` has, capped at ``limit`` (LLEN)."""
+        if self._client is not None:
+            self._await_writes(agent)
+            total = self._client.llen(_key(agent))
+        else:
+            total = len(self._store.get(agent, ()))
+        return total if limit is None else min(total, max(0, limit))
+
+
+@functools.lru_cache(maxsize=1)
+def get_short_term_memory() -> ShortTermMemory:
+    """Return the process-wide ShortTermMemory, connecting to Redis on first use.
+
+    The Redis client is thread-safe (it draws from a connection pool), so one
+    instance serves all requests. If Redis was unreachable at that point, this
+    instance keeps using the in-memory store.
+    """
+    return ShortTermMemory()
@@ -11,22 +11,98 @@ Includes:
 
 from __future__ import annotations
 
-import json
+import contextlib
+import logging
+import os
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
 import structlog
-from celery import group, shared_task
+from celery import shared_task
+from celery.signals import worker_process_init
 
 from agents_core.agile_coach import AgileCoachAgent
+from agents_core.cache import LRUCache
 from agents_core.dynamic_expert import (
     DynamicExpertAgent,
+    ExpertSpec,
     select_experts_from_tasks,
 )
+from agents_core.llm import _env_truthy, detect_llm, json_dumps, provider_key
 from agents_core.product_owner import ProductOwnerAgent
-from memory.long_term import KnowledgeGraph
-from memory.short_term import ShortTermMemory
+from memory.long_term import get_knowledge_graph
+from memory.short_term import ShortTermMemory, get_short_term_memory
 
 logger = structlog.get_logger(__name__)
 
 
+# Resolved once: ProductOwnerAgent is fixed, so there is no need for a per-call hasattr()
+_PO_HAS_DEBUG = hasattr(ProductOwnerAgent, "plan_work_debug")
+
+
+# Agents hold no per-call state besides their memory handle, so each worker process
+# builds them once; all share the process-wide short-term memory.
+@lru_cache(maxsize=1)
+def _get_po() -> ProductOwnerAgent:
+    return ProductOwnerAgent(name="po", role="Product Owner", memory=get_short_term_memory())
+
+
+@lru_cache(maxsize=1)
+def _get_ac() -> AgileCoachAgent:
+    return AgileCoachAgent(name="ac", role="Agile Coach", memory=get_short_term_memory())
+
+
+# Keyed by memory too, so a cached expert is never re-pointed at another memory while a
+# concurrent call is using it
+@lru_cache(maxsize=128)
+def _get_expert(expertise: str, memory: ShortTermMemory) -> DynamicExpertAgent:
+    return DynamicExpertAgent(
+        name=f"expert-{expertise}", role="Expert", expertise=expertise, memory=memory
+    )
+
+
+@worker_process_init.connect
+def _warm_agents(**_kwargs: object) -> None:  # pragma: no cover - Celery worker hook
+    """Build the shared memory and core agents before the first task arrives."""
+    _get_po()
+    _get_ac()
+
+
+# Opt-in (EXPERTS_PIPELINE_CACHE=1, like AGENT_SEMANTIC_CACHE): plan + expert names per
+# (provider key, description) for EXPERTS_PIPELINE_CACHE_TTL seconds
+_PipelinePlan = tuple[tuple[str, ...], tuple[str, ...]]
+_PIPELINE_CACHE: LRUCache[tuple[str, str], _PipelinePlan] = LRUCache(
+    maxsize=256, ttl=float(os.getenv("EXPERTS_PIPELINE_CACHE_TTL", "300"))
+)
+
+
+def _expert_names(specs: Iterable[ExpertSpec]) -> tuple[str, ...]:
+    """Distinct expertise names in first-seen order: each expert is prepared once."""
+    return tuple(dict.fromkeys(s.expertise for s in specs))
+
+
+def _plan_and_select(po: ProductOwnerAgent, description: str) -> _PipelinePlan:
+    """Plan ``description`` and select its experts, reusing a recent identical run if enabled.
+
+    A reused run still records the ``planning:`` observation, so short-term memory
+    looks the same as after a fresh plan.
+    """
+    pkey: str | None = None
+    if _env_truthy("EXPERTS_PIPELINE_CACHE", "0") and _PIPELINE_CACHE.ttl:
+        pkey = provider_key(po.llm or detect_llm())  # None: provider is not cacheable
+    if pkey is not None:
+        cached = _PIPELINE_CACHE.get((pkey, description))
+        if cached is not None:
+            po.observe(f"planning: {description}")
+            return cached
+    tasks, (specs, _sel_dbg) = po.plan_and_select(description)
+    result = (tuple(tasks), _expert_names(specs))
+    if pkey is not None:
+        _PIPELINE_CACHE.set((pkey, description), result)
+    return result
+
+
 def _retro_insights(stm: ShortTermMemory) -> dict[str, object]:
     """Compute simple retrospective insights from short-term memory.
 
@@ -36,12 +112,12 @@ def _retro_insights(stm: ShortTermMemory) -> dict[str, object]:
     agents = ("po", "ac")
     summaries: list[dict[str, object]] = []
     for agent in agents:
-        hist = stm.history(agent, limit=5)
+        # Two integer/single-item replies instead of fetching the last five payloads
         summaries.append(
             {
                 "agent": agent,
-                "count": len(hist),
-                "last": hist[-1] if hist else "",
+                "count": stm.count(agent, 5),
+                "last": stm.last(agent),
             }
         )
     return {"summaries": summaries}
@@ -57,34 +133,29 @@ def run_retro() -> str:
     """
     logger.info("retro.run", status="started")
 
-    # Short-term memory shared across this small workflow
-    stm = ShortTermMemory()
-
     # Attempt to schedule a retrospective via the Agile Coach agent
     msg = "retro scheduled"
-    try:
-        ac = AgileCoachAgent(name="ac", role="Agile Coach", memory=stm)
-        msg = ac.schedule_retro()
-    except Exception:  # pragma: no cover - defensive  # pylint: disable=broad-exception-caught
-        pass
-
-    # Record a brief note in long-term memory (no-op if Neo4j not configured)
-    try:
-        kg = KnowledgeGraph()
-        kg.upsert_note("ac", f"retro: {msg}")
-    except Exception:  # pragma: no cover - defensive  # pylint: disable=broad-exception-caught
-        pass
-
-    # Derive and log lightweight insights
-    insights = _retro_insights(stm)
-    logger.info("retro.insights", insights=insights)
-
-    # Persist insights as a compact note (no-op if Neo4j not configured)
-    try:
-        kg = KnowledgeGraph()
-        kg.upsert_note("ac", f"retro_insights: {json.dumps(insights, separators=(',', ':'))}")
-    except Exception:  # pragma: no cover - defensive  # pylint: disable=broad-exception-caught
-        pass
+    with contextlib.suppress(Exception):  # pragma: no cover - defensive
+        msg = _get_ac().schedule_retro()
+
+    # Insights only feed the INFO log and the knowledge graph; skip deriving them when
+    # the level filters INFO out and Neo4j is not configured
+    kg = get_knowledge_graph()
+    log_insights = logger.is_enabled_for(logging.INFO)
+    if log_insights or kg.enabled:
+        insights = _retro_insights(get_short_term_memory())
+        if log_insights:
+            logger.info("retro.insights", insights=insights)
+        # Persist the retro and its insights as compact notes in one write; without
+        # Neo4j the insights are not even serialized
+        if kg.enabled:
+            with contextlib.suppress(Exception):  # pragma: no cover - defensive
+                kg.upsert_notes(
+                    [
+                        ("ac", f"retro: {msg}"),
+                        ("ac", f"retro_insights: {json_dumps(insights).decode()}"),
+                    ]
+                )
 
     logger.info("retro.run", status="finished")
     return "ok"
@@ -96,14 +167,37 @@ def expert_prepare(expertise: str, user_msg: str) -> dict[str, str]:
 
     Returns a mapping with the expert name and the preparation message.
     """
-    stm = ShortTermMemory()
-    agent = DynamicExpertAgent(
-        name=f"expert-{expertise}", role="Expert", expertise=expertise, memory=stm
-    )
-    message = agent.solve(f"Prepare for: {user_msg}")
+    return _prepare(expertise, user_msg, get_short_term_memory())
+
+
+def _prepare(expertise: str, user_msg: str, stm: ShortTermMemory) -> dict[str, str]:
+    """Body of ``expert_prepare``, callable inline with a shared memory instance."""
+    agent = _get_expert(expertise, stm)
+    with stm.batch():
+        message = agent.solve(f"Prepare for: {user_msg}")
     return {"expert": expertise, "message": message}
 
 
+def _prepare_all(expert_names: list[str], user_msg: str, stm: ShortTermMemory) -> dict[str, str]:
+    """Prepare every expert and return the deterministic expert -> message mapping.
+
+    Worker threads write through their own batches; Celery's group().apply() would
+    have run them serially. map() yields in input order, so messages go straight
+    into the mapping. A single expert (the common case for short descriptions)
+    runs inline without a pool.
+    """
+    if len(expert_names) == 1:
+        name = expert_names[0]
+        return {name: _prepare(name, user_msg, stm)["message"]}
+    results_map: dict[str, str] = {}
+    if expert_names:
+        with ThreadPoolExecutor(max_workers=min(8, len(expert_names))) as pool:
+            messages = pool.map(lambda name: _prepare(name, user_msg, stm)["message"], expert_names)
+            for name, message in zip(expert_names, messages, strict=True):
+                results_map[name] = message
+    return results_map
+
+
 @shared_task
 def run_experts_pipeline(description: str, debug: bool = False) -> dict[str, object]:
     """End-to-end experts pipeline.
@@ -116,33 +210,24 @@ def run_experts_pipeline(description: str, debug: bool = False) -> dict[str, obj
     logger.info("experts.pipeline", stage="start")
 
     # Short-term memory shared across agents in this pipeline
-    stm = ShortTermMemory()
-
-    # 1) Plan
-    po = ProductOwnerAgent(name="po", role="Product Owner", memory=stm)
-    if debug and hasattr(po, "plan_work_debug"):
-        tasks, plan_dbg = po.plan_work_debug(description)  # type: ignore[attr-defined]
-    else:
-        tasks = po.plan_work(description)
-        plan_dbg = None
-
-    # 2) Select experts
-    specs, sel_dbg = select_experts_from_tasks(tasks)
-    expert_names = [s.expertise for s in specs]
-
-    # 3) Prepare experts in parallel
-    results: list[dict[str, str]] = []
-    try:
-        # Execute synchronously in-process to avoid requiring a broker in tests/local
-        job_result = group(expert_prepare.s(name, description) for name in expert_names).apply()
-        results = job_result.get()
-    except Exception:  # pragma: no cover  # pylint: disable=broad-exception-caught
-        # Run inline without a broker (sequential but reliable in dev/tests)
-        for name in expert_names:
-            results.append(expert_prepare.apply(args=(name, description)).get())
-
-    # Aggregate to a deterministic mapping
-    results_map: dict[str, str] = {item["expert"]: item["message"] for item in results}
+    stm = get_short_term_memory()
+
+    # One Redis round-trip for all observations of this run (nested batches join it)
+    with stm.batch():
+        # 1) Plan and 2) select experts. With EXPERTS_PIPELINE_CACHE=1 repeated
+        # descriptions skip both steps unless debugging, which needs a fresh plan_dbg.
+        po = _get_po()
+        if debug and _PO_HAS_DEBUG:
+            tasks, plan_dbg = po.plan_work_debug(description)
+            specs, sel_dbg = select_experts_from_tasks(tasks)
+            expert_names = list(_expert_names(specs))
+        else:
+            cached_tasks, cached_names = _plan_and_select(po, description)
+            tasks, expert_names = list(cached_tasks), list(cached_names)
+            plan_dbg = sel_dbg = None
+
+    # 3) Prepare experts in parallel, in-process (no broker needed)
+    results_map = _prepare_all(expert_names, description, stm)
 
     payload: dict[str, object] = {
         "tasks": tasks,
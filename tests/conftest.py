@@ -1,12 +1,35 @@
 from __future__ import annotations
 
 import os
+from typing import TYPE_CHECKING
 
 import django
 import pytest
 
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from django.test import Client
+
 
 @pytest.fixture(scope="session", autouse=True)
 def django_setup() -> None:
     os.environ.setdefault("DJANGO_SETTINGS_MODULE", "aiteam.settings")
     django.setup()
+
+
+@pytest.fixture(autouse=True)
+def api_config() -> None:
+    """Start every test from API security settings matching the current environment."""
+    from apps.api import views
+
+    views.reload_config()
+
+
+@pytest.fixture(scope="session")
+def client(django_setup: None) -> Client:
+    """One Django test client for the session (overrides pytest-django's per-test one).
+
+    Requests through it do not log in, so no state carries over between tests.
+    """
+    from django.test import Client
+
+    return Client()
@@ -0,0 +1,68 @@
+"""Micro-benchmarks guarding the per-request hot paths against regressions.
+
+Save a baseline with ``make bench-save`` and compare against it with
+``make bench-compare`` (fails when the mean regresses by more than 10%).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from agents_core import dynamic_expert  # noqa: E402
+from agents_core.dynamic_expert import select_experts_from_tasks  # noqa: E402
+from tools import web  # noqa: E402
+
+_HTML = (
+    "<html><head><title>Docs</title><style>.x{}</style><script>track()</script></head>"
+    "<body>" + "<p>Some <b>visible</b> paragraph text.</p>" * 200 + "</body></html>"
+).encode()
+
+
+class _Resp:
+    status_code = 200
+    headers = {"content-type": "text/html; charset=utf-8"}
+    encoding = "utf-8"
+
+    def __enter__(self) -> _Resp:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        return None
+
+    def raise_for_status(self) -> None:
+        return None
+
+    def iter_content(self, chunk_size: int = 1) -> Iterator[bytes]:
+        yield _HTML
+
+
+def _clear_fetch_caches() -> None:
+    # No validators are sent today, but keep every round on the full fetch + extract path
+    web._RESPONSE_CACHE.clear()
+
+
+def test_fetch_url_bench(benchmark: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(web._SESSION, "get", lambda url, **_kwargs: _Resp())
+    text = benchmark.pedantic(
+        web.fetch_url, args=("http://x",), setup=_clear_fetch_caches, rounds=200
+    )
+    assert text.startswith("Docs Some visible")
+
+
+def _clear_selection_caches() -> None:
+    # Time keyword matching and selection, not a memoized hit plus deepcopy
+    dynamic_expert._SELECTION_CACHE.clear()
+    dynamic_expert._heuristic_categories.cache_clear()
+
+
+def test_experts_bench(benchmark: Any) -> None:
+    tasks = ["Draft a GDPR-compliant DPA and Q3 budget"]
+    specs, _dbg = benchmark.pedantic(
+        select_experts_from_tasks, args=(tasks,), setup=_clear_selection_caches, rounds=200
+    )
+    assert {"legal", "finance"} <= {s.expertise for s in specs}
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import pytest
+
 from agents_core.agile_coach import AgileCoachAgent
 from agents_core.product_owner import ProductOwnerAgent
 from memory.short_term import ShortTermMemory
@@ -17,3 +19,102 @@ def test_agents_smoke() -> None:
 
     msg = ac.schedule_retro()
     assert "retro" in msg.lower()
+
+
+def test_plan_and_select_matches_separate_calls() -> None:
+    from agents_core.dynamic_expert import select_experts_from_tasks
+
+    po = ProductOwnerAgent(name="PO", role="Product Owner", memory=ShortTermMemory())
+    tasks, (specs, dbg) = po.plan_and_select("Build a Django API with a React UI")
+    assert tasks == po.plan_work("Build a Django API with a React UI")
+    expected_specs, _ = select_experts_from_tasks(tasks)
+    assert [s.expertise for s in specs] == [s.expertise for s in expected_specs]
+    assert dbg["final"] == [s.expertise for s in specs]
+
+
+def test_think_reuses_cached_thought(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Repeated goals should be answered from the thought cache once it is enabled."""
+    from agents_core import base
+
+    class CountingLLM:
+        model = "think-counter"
+
+        def __init__(self) -> None:
+            self.calls = 0
+
+        def generate(self, prompt: str) -> str:  # noqa: D401
+            self.calls += 1
+            return "Clarify the scope first."
+
+    base._THOUGHT_CACHE.clear()
+    llm = CountingLLM()
+    po = ProductOwnerAgent(name="PO", role="Product Owner", llm=llm)
+    # Off by default: every call asks the provider
+    po.think_debug("Ship the MVP")
+    assert llm.calls == 1 and not len(base._THOUGHT_CACHE)
+
+    monkeypatch.setenv("AGENT_THINK_CACHE", "1")
+    llm.calls = 0
+    first, dbg1 = po.think_debug("Ship the  MVP")
+    second, dbg2 = po.think_debug("Ship the MVP")
+    assert first == second == "Clarify the scope first."
+    assert llm.calls == 1
+    assert dbg1["cache_hit"] is False and dbg2["cache_hit"] is True
+
+    monkeypatch.setenv("AGENT_THINK_CACHE", "0")
+    po.think_debug("Ship the MVP")
+    assert llm.calls == 2
+
+
+def test_generate_chat_prefers_message_api() -> None:
+    """Chat-capable providers get system/user messages; others a system-first prompt."""
+    from agents_core.llm import EchoLLM, generate_chat
+
+    class ChatLLM:
+        def generate_messages(self, messages: list[dict[str, str]]) -> str:  # noqa: D401
+            return "|".join(m["role"] for m in messages)
+
+    assert generate_chat(ChatLLM(), "sys", "usr") == "system|user"
+    assert generate_chat(EchoLLM(), "sys", "usr") == "sys\nusr"
+
+
+def test_semantic_cache_matches_similar_texts() -> None:
+    from agents_core.cache import SemanticCache
+
+    cache: SemanticCache[str] = SemanticCache(maxsize=2, threshold=0.8)
+    cache.set("ns", "Build a chat app with login", "plan-a")
+    assert cache.get("ns", "build  a CHAT app with login") == "plan-a"  # exact fast path
+    assert cache.get("ns", "Build a chat app with a login") == "plan-a"  # cosine ~0.94
+    assert cache.get("ns", "Write quarterly finance report") is None
+    assert cache.get("other", "Build a chat app with login") is None
+    cache.set("ns", "one", "1")
+    cache.set("ns", "two", "2")
+    assert len(cache) == 2 and cache.get("ns", "Build a chat app with login") is None
+
+
+def test_plan_work_semantic_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Near-duplicate descriptions reuse a plan once the semantic cache is enabled."""
+    from agents_core import product_owner
+
+    class CountingLLM:
+        model = "plan-counter"
+
+        def __init__(self) -> None:
+            self.calls = 0
+
+        def generate(self, prompt: str) -> str:  # noqa: D401
+            self.calls += 1
+            return "- Design the login form\n- Add session handling"
+
+    monkeypatch.setenv("AGENT_SEMANTIC_CACHE", "1")
+    monkeypatch.setenv("ENABLE_LLM_CACHE", "0")
+    product_owner._PLAN_CACHE.clear()
+    llm = CountingLLM()
+    po = ProductOwnerAgent(name="PO", role="Product Owner", llm=llm)
+    tasks1, dbg1 = po.plan_work_debug("Build a login page for the web app")
+    tasks2, dbg2 = po.plan_work_debug("Build the login page for the web app")
+    assert tasks1 == tasks2 and llm.calls == 1
+    assert dbg1["cache_hit"] is False and dbg2["cache_hit"] is True
+    # Live-state requests always go to the LLM
+    po.plan_work_debug("Build a login page for the web app now")
+    assert llm.calls == 2
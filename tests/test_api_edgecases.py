@@ -9,16 +9,22 @@ from agents_core.llm import OpenAILLM, detect_llm
 
 
 def test_auth_guard_unauthorized_then_authorized(monkeypatch: pytest.MonkeyPatch) -> None:
+    from apps.api import views
 
     # Enable auth and set token
     monkeypatch.setenv("API_ENABLE_AUTH", "1")
     monkeypatch.setenv("API_TOKEN", "secret")
+    views.reload_config()
     client = Client()
 
     # Missing header -> 401
     resp1 = client.get("/api/version")
     assert resp1.status_code == 401
 
+    # Wrong or non-ASCII token -> 401
+    assert client.get("/api/version", **{"HTTP_X_API_TOKEN": "secreT"}).status_code == 401
+    assert client.get("/api/version", **{"HTTP_X_API_TOKEN": "sécret"}).status_code == 401
+
     # Correct token header -> 200
     resp2 = client.get("/api/version", **{"HTTP_X_API_TOKEN": "secret"})
     assert resp2.status_code == 200
@@ -30,9 +36,10 @@ def test_rate_limiting_blocks_after_limit(monkeypatch: pytest.MonkeyPatch) -> No
     # Enable RL with small quota
     monkeypatch.setenv("API_RATE_LIMIT_ENABLED", "1")
     monkeypatch.setenv("API_RATE_LIMIT_PER_MIN", "2")
+    views.reload_config()
 
     # Reset buckets between tests
-    views._RL_BUCKETS.clear()  # type: ignore[attr-defined]
+    views._clear_rate_limits()  # type: ignore[attr-defined]
 
     client = Client()
     headers = {"HTTP_X_API_TOKEN": "same-token-for-key"}
@@ -45,18 +52,84 @@ def test_rate_limiting_blocks_after_limit(monkeypatch: pytest.MonkeyPatch) -> No
     assert resp3.status_code == 429
 
 
+def test_rate_limit_refills_over_time(monkeypatch: pytest.MonkeyPatch) -> None:
+    from apps.api import views
+
+    monkeypatch.setenv("API_RATE_LIMIT_ENABLED", "1")
+    monkeypatch.setenv("API_RATE_LIMIT_PER_MIN", "2")
+    views.reload_config()
+    views._clear_rate_limits()  # type: ignore[attr-defined]
+    clock = [1000.0]
+    monkeypatch.setattr(views.time, "monotonic", lambda: clock[0])
+
+    client = Client()
+    headers = {"HTTP_X_API_TOKEN": "refill-token"}
+    assert client.get("/api/version", **headers).status_code == 200
+    assert client.get("/api/version", **headers).status_code == 200
+    assert client.get("/api/version", **headers).status_code == 429
+    # Two tokens per minute -> one token every 30 seconds
+    clock[0] += 30.0
+    assert client.get("/api/version", **headers).status_code == 200
+    assert client.get("/api/version", **headers).status_code == 429
+
+
+def test_rate_limit_stripes_sweep_idle_buckets(monkeypatch: pytest.MonkeyPatch) -> None:
+    from apps.api import views
+
+    monkeypatch.setattr(views, "_RL_STRIPE_MAX", 2)
+    views._clear_rate_limits()  # type: ignore[attr-defined]
+    stripe = views._RL_BUCKETS[hash("a") & (views._RL_STRIPES - 1)]  # type: ignore[attr-defined]
+    stripe["idle"] = (1.0, 0.0)
+    stripe["busy"] = (1.0, 990.0)
+    assert views._take_token("a", 2.0, 1000.0)  # type: ignore[attr-defined]
+    # The idle bucket is swept; the recently used one survives while under the bound
+    assert "idle" not in stripe and "busy" in stripe and "a" in stripe
+    views._clear_rate_limits()  # type: ignore[attr-defined]
+
+
 def test_rate_limit_invalid_value_default(monkeypatch: pytest.MonkeyPatch) -> None:
     from apps.api import views
 
     monkeypatch.setenv("API_RATE_LIMIT_ENABLED", "1")
     monkeypatch.setenv("API_RATE_LIMIT_PER_MIN", "bad")  # triggers default path
-    views._RL_BUCKETS.clear()  # type: ignore[attr-defined]
+    views.reload_config()
+    views._clear_rate_limits()  # type: ignore[attr-defined]
 
     client = Client()
     # Should still work and not crash
     assert client.get("/api/version").status_code == 200
 
 
+def test_invalid_utf8_body_is_bad_request() -> None:
+    client = Client()
+    resp = client.post("/api/plan", data=b"\xff\xfe{", content_type="application/json")
+    assert resp.status_code == 400
+    assert "non_field_errors" in resp.json()["errors"]
+
+
+def test_parse_body_is_memoized_per_request() -> None:
+    from django.test import RequestFactory
+
+    from apps.api import views
+
+    request = RequestFactory().post("/api/plan", data={"a": 1}, content_type="application/json")
+    first = views._parse_body(request)  # type: ignore[attr-defined]
+    assert first == {"a": 1}
+    assert views._parse_body(request) is first  # type: ignore[attr-defined]
+
+
+def test_oversize_body_rejected(monkeypatch: pytest.MonkeyPatch) -> None:
+    from apps.api import views
+
+    monkeypatch.setenv("API_MAX_BODY_BYTES", "64")
+    views.reload_config()
+    client = Client()
+    big = json.dumps({"description": "x" * 100})
+    assert client.post("/api/plan", data=big, content_type="application/json").status_code == 413
+    small = json.dumps({"description": "ok"})
+    assert client.post("/api/plan", data=small, content_type="application/json").status_code == 200
+
+
 def test_memory_history_invalid_limit() -> None:
     client = Client()
     resp = client.get("/api/memory/po/history", {"limit": "bad"})
@@ -185,3 +258,12 @@ def test_detect_llm_openai_when_enabled(monkeypatch: pytest.MonkeyPatch) -> None
     monkeypatch.delenv("TRANSFORMERS_MODEL", raising=False)
     provider = detect_llm()
     assert isinstance(provider, OpenAILLM)
+
+
+def test_detect_llm_reuses_provider_until_env_changes(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("ENABLE_LLM", "1")
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    first = detect_llm()
+    assert detect_llm() is first
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-other")
+    assert detect_llm() is not first
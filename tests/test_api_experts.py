@@ -2,8 +2,12 @@ from __future__ import annotations
 
 import json
 
+import pytest
 from django.test import Client
 
+from agents_core.product_owner import ProductOwnerAgent
+from orchestrator import tasks as orchestrator_tasks
+
 
 def test_experts_run_basic() -> None:
     client = Client()
@@ -65,3 +69,96 @@ def test_experts_run_invalid_serializer() -> None:
         content_type="application/json",
     )
     assert resp.status_code == 400
+
+
+def test_pipeline_reuses_plan_for_repeated_description(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("EXPERTS_PIPELINE_CACHE", "1")
+    orchestrator_tasks._PIPELINE_CACHE.clear()
+    calls: list[str] = []
+    original = ProductOwnerAgent.plan_work
+
+    def counting_plan_work(self: ProductOwnerAgent, description: str) -> list[str]:
+        calls.append(description)
+        return original(self, description)
+
+    monkeypatch.setattr(ProductOwnerAgent, "plan_work", counting_plan_work)
+    stm = orchestrator_tasks.get_short_term_memory()
+    first = orchestrator_tasks.run_experts_pipeline("Ship a Django REST endpoint")
+    stm.append("po", "marker")
+    second = orchestrator_tasks.run_experts_pipeline("Ship a Django REST endpoint")
+    assert calls == ["Ship a Django REST endpoint"]
+    # A reused plan still records the planning observation
+    assert stm.last("po") == "planning: Ship a Django REST endpoint"
+    assert first["tasks"] == second["tasks"]
+    assert first["experts"] == second["experts"]
+    assert set(second["results"]) == set(second["experts"])  # type: ignore[arg-type]
+    # Debug runs always plan afresh so plan_dbg describes this call
+    debug_run = orchestrator_tasks.run_experts_pipeline("Ship a Django REST endpoint", debug=True)
+    assert debug_run["_debug"]["plan"] is not None  # type: ignore[index]
+
+
+def test_pipeline_plans_afresh_by_default(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("EXPERTS_PIPELINE_CACHE", raising=False)
+    orchestrator_tasks._PIPELINE_CACHE.clear()
+    calls: list[str] = []
+    original = ProductOwnerAgent.plan_work
+
+    def counting_plan_work(self: ProductOwnerAgent, description: str) -> list[str]:
+        calls.append(description)
+        return original(self, description)
+
+    monkeypatch.setattr(ProductOwnerAgent, "plan_work", counting_plan_work)
+    orchestrator_tasks.run_experts_pipeline("Write the release notes")
+    orchestrator_tasks.run_experts_pipeline("Write the release notes")
+    assert calls == ["Write the release notes"] * 2
+    assert not len(orchestrator_tasks._PIPELINE_CACHE)
+
+
+def test_pipeline_prepares_each_expertise_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    from agents_core.dynamic_expert import ExpertSpec
+
+    duplicated = [
+        ExpertSpec(expertise="backend", confidence=0.7, source="heuristic"),
+        ExpertSpec(expertise="qa", confidence=0.7, source="heuristic"),
+        ExpertSpec(expertise="backend", confidence=0.9, source="llm"),
+    ]
+    prepared: list[str] = []
+    original = orchestrator_tasks._prepare
+
+    def recording_prepare(expertise: str, user_msg: str, stm: object) -> dict[str, str]:
+        prepared.append(expertise)
+        return original(expertise, user_msg, stm)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(
+        orchestrator_tasks, "select_experts_from_tasks", lambda tasks: (duplicated, {})
+    )
+    monkeypatch.setattr(orchestrator_tasks, "_prepare", recording_prepare)
+    payload = orchestrator_tasks.run_experts_pipeline("Harden the backend", debug=True)
+    assert payload["experts"] == ["backend", "qa"]
+    assert sorted(prepared) == ["backend", "qa"]
+
+
+def test_pipeline_single_expert_runs_without_thread_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    from agents_core.dynamic_expert import ExpertSpec
+
+    def _no_pool(*_args: object, **_kwargs: object) -> None:
+        raise AssertionError("thread pool used for a single expert")
+
+    monkeypatch.setattr(
+        orchestrator_tasks,
+        "select_experts_from_tasks",
+        lambda tasks: ([ExpertSpec(expertise="qa", confidence=0.7, source="heuristic")], {}),
+    )
+    monkeypatch.setattr(orchestrator_tasks, "ThreadPoolExecutor", _no_pool)
+    payload = orchestrator_tasks.run_experts_pipeline("Add regression tests", debug=True)
+    assert payload["experts"] == ["qa"]
+    assert "Prepare for: Add regression tests" in payload["results"]["qa"]  # type: ignore[index]
+
+
+def test_prepare_does_not_repoint_cached_experts() -> None:
+    shared = orchestrator_tasks.get_short_term_memory()
+    other = orchestrator_tasks.ShortTermMemory()
+    orchestrator_tasks._prepare("qa", "first", shared)
+    orchestrator_tasks._prepare("qa", "second", other)
+    assert orchestrator_tasks._get_expert("qa", shared).memory is shared
+    assert orchestrator_tasks._get_expert("qa", other).memory is other
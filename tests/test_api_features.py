@@ -20,6 +20,28 @@ def test_plan_endpoint_returns_tasks() -> None:
     assert all(isinstance(t, str) and t.strip() for t in data["tasks"])  # non-empty strings
 
 
+def test_plan_endpoint_streams_server_sent_events() -> None:
+    import asyncio
+
+    from django.test import AsyncClient
+
+    async def _collect() -> tuple[int, str, str]:
+        resp = await AsyncClient().post(
+            "/api/plan",
+            data=json.dumps({"description": "Build chat"}),
+            content_type="application/json",
+            headers={"Accept": "text/event-stream"},
+        )
+        body = b"".join([chunk async for chunk in resp.streaming_content])
+        return resp.status_code, resp["Content-Type"], body.decode()
+
+    status, content_type, body = asyncio.run(_collect())
+    assert status == 200 and content_type.startswith("text/event-stream")
+    count = body.count("event: task\n")
+    assert count >= 1
+    assert body.endswith(f'event: done\ndata: {{"count": {count}}}\n\n')
+
+
 def test_ac_feedback_endpoint_returns_feedback() -> None:
     client = Client()
     resp = client.post(
@@ -68,6 +90,24 @@ def test_memory_append_and_history_roundtrip() -> None:
     assert any(item in s for s in data.get("items", []))
 
 
+def test_memory_append_many_items() -> None:
+    client = Client()
+    items = ["batch one", "batch two"]
+    resp = client.post(
+        "/api/memory/ac/append", data=json.dumps({"items": items}), content_type="application/json"
+    )
+    assert resp.status_code == 201 and resp.json()["items"] == items
+    history = client.get("/api/memory/ac/history", {"limit": 2}).json()["items"]
+    assert history == items
+    # Both fields at once is ambiguous
+    resp = client.post(
+        "/api/memory/ac/append",
+        data=json.dumps({"item": "x", "items": ["y"]}),
+        content_type="application/json",
+    )
+    assert resp.status_code == 400
+
+
 def test_agent_think_endpoint() -> None:
     client = Client()
     resp = client.post(
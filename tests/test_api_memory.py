@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import pytest
 from django.test import Client
 
-from memory.short_term import ShortTermMemory
+from memory.short_term import ShortTermMemory, get_short_term_memory
 
 
 def test_memory_history_endpoint() -> None:
@@ -21,3 +22,274 @@ def test_memory_history_endpoint() -> None:
     assert len(data["items"]) <= 2
     # At least one of our entries should be present
     assert any("Build chat" in it for it in data["items"])
+
+
+def test_short_term_memory_is_shared_per_process() -> None:
+    stm = get_short_term_memory()
+    assert stm is get_short_term_memory()
+    stm.append("po", "shared entry")
+    # The in-memory fallback store is shared with ad-hoc instances too
+    assert "shared entry" in ShortTermMemory().history("po", limit=5)
+
+
+def test_short_term_memory_append_batch() -> None:
+    stm = ShortTermMemory()
+    stm.append_batch([("expert-a", "a1"), ("expert-b", "b1"), ("expert-a", "a2")])
+    assert stm.history("expert-a", limit=2) == ["a1", "a2"]
+    assert stm.history("expert-b", limit=1) == ["b1"]
+
+
+def test_short_term_memory_last_and_count_in_memory() -> None:
+    stm = ShortTermMemory()
+    assert stm.last("fresh-agent") == "" and stm.count("fresh-agent") == 0
+    stm.append_many("fresh-agent", ["a", "b", "c"])
+    assert stm.last("fresh-agent") == "c"
+    assert stm.count("fresh-agent") == 3 and stm.count("fresh-agent", 2) == 2
+
+
+def test_short_term_memory_batch_uses_one_pipeline() -> None:
+    class _Pipe:
+        def __init__(self, sink: list[tuple[str, tuple[str, ...]]]) -> None:
+            self.sink, self.buffer = sink, []
+
+        def rpush(self, key: str, *items: str) -> None:
+            self.buffer.append((key, items))
+
+        def ltrim(self, key: bytes, start: int, end: int) -> None:
+            self.buffer.append((b"ltrim:" + key, (str(start), str(end))))
+
+        def execute(self) -> None:
+            self.sink.append(("execute", tuple(k for k, _ in self.buffer)))
+
+    class _Client:
+        def __init__(self) -> None:
+            self.calls: list[tuple[str, tuple[str, ...]]] = []
+
+        def rpush(self, key: str, *items: str) -> None:  # pragma: no cover - must be batched
+            self.calls.append((key, items))
+
+        def pipeline(self, transaction: bool = True) -> _Pipe:
+            return _Pipe(self.calls)
+
+    stm = ShortTermMemory()
+    stm._client = _Client()  # type: ignore[assignment]
+    with stm.batch():
+        stm.append("po", "a")
+        with stm.batch():  # nested blocks join the outer pipeline
+            stm.append_many("ac", ["b", "c"])
+    assert stm._client.calls == [  # type: ignore[union-attr]
+        ("execute", (b"stm:po", b"ltrim:stm:po", b"stm:ac", b"ltrim:stm:ac"))
+    ]
+
+
+def test_async_writes_are_pipelined_by_background_thread() -> None:
+    import threading
+
+    class _Pipe:
+        def __init__(self, client: _Client) -> None:
+            self.client, self.ops = client, []
+
+        def rpush(self, key: bytes, *items: str) -> None:
+            self.ops.append((key, items))
+
+        def ltrim(self, key: bytes, start: int, end: int) -> None:
+            return None
+
+        def execute(self) -> None:
+            self.client.executes.append(threading.current_thread().name)
+            for key, items in self.ops:
+                self.client.lists.setdefault(key, []).extend(items)
+
+    class _Client:
+        def __init__(self) -> None:
+            self.lists: dict[bytes, list[str]] = {}
+            self.executes: list[str] = []
+
+        def pipeline(self, transaction: bool = True) -> _Pipe:
+            return _Pipe(self)
+
+        def lrange(self, key: bytes, start: int, end: int) -> list[str]:
+            return self.lists.get(key, [])[start:]
+
+    stm = ShortTermMemory()
+    stm._client = _Client()  # type: ignore[assignment]
+    stm._async_writes = True
+    stm.append("po", "a")
+    stm.append_many("po", ["b", "c"])
+    stm.append_batch([("po", "d")])
+    # Reads wait for queued writes, so they see every append
+    assert stm.history("po", limit=10) == ["a", "b", "c", "d"]
+    assert stm.flush(timeout=1.0)
+    assert set(stm._client.executes) == {"stm-writer"}  # type: ignore[union-attr]
+
+
+def test_async_reads_fence_only_on_their_own_agent() -> None:
+    import threading
+
+    release = threading.Event()
+
+    class _Pipe:
+        def __init__(self, client: _Client) -> None:
+            self.client, self.ops = client, []
+
+        def rpush(self, key: bytes, *items: str) -> None:
+            self.ops.append((key, items))
+
+        def ltrim(self, key: bytes, start: int, end: int) -> None:
+            return None
+
+        def execute(self) -> None:
+            release.wait(5.0)  # the writer is stuck sending "po"'s items
+            for key, items in self.ops:
+                self.client.lists.setdefault(key, []).extend(items)
+
+    class _Client:
+        def __init__(self) -> None:
+            self.lists: dict[bytes, list[str]] = {b"stm:ac": ["old"]}
+
+        def pipeline(self, transaction: bool = True) -> _Pipe:
+            return _Pipe(self)
+
+        def lindex(self, key: bytes, index: int) -> str | None:
+            items = self.lists.get(key, [])
+            return items[index] if items else None
+
+    stm = ShortTermMemory()
+    stm._client = _Client()  # type: ignore[assignment]
+    stm._async_writes = True
+    stm.append("po", "queued")
+    assert stm.last("ac") == "old"  # does not wait behind the unrelated "po" write
+    assert not stm.flush(timeout=0.01)
+    release.set()
+    assert stm.last("po") == "queued"
+    assert stm.flush(timeout=1.0)
+
+
+class _ListPipe:
+    """Pipeline stand-in appending to ``client.lists`` on execute (or failing)."""
+
+    def __init__(self, client: _ListClient) -> None:
+        self.client, self.ops = client, []
+
+    def rpush(self, key: bytes, *items: str) -> None:
+        self.ops.append((key, items))
+
+    def ltrim(self, key: bytes, start: int, end: int) -> None:
+        return None
+
+    def execute(self) -> None:
+        if self.client.fail:
+            from memory import short_term
+
+            raise short_term._RedisError("connection lost")
+        for key, items in self.ops:
+            self.client.lists.setdefault(key, []).extend(items)
+
+
+class _ListClient:
+    def __init__(self) -> None:
+        self.lists: dict[bytes, list[str]] = {}
+        self.fail = False
+
+    def pipeline(self, transaction: bool = True) -> _ListPipe:
+        return _ListPipe(self)
+
+    def lrange(self, key: bytes, start: int, end: int) -> list[str]:
+        return self.lists.get(key, [])[start:]
+
+
+def test_full_write_queue_keeps_agent_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    import threading
+
+    from memory import short_term
+
+    monkeypatch.setattr(short_term, "_QUEUE_MAX", 1)
+    stm = ShortTermMemory()
+    stm._client = _ListClient()  # type: ignore[assignment]
+    stm._async_writes = True
+    start_writer = stm._ensure_writer
+    stm._ensure_writer = lambda: None  # type: ignore[method-assign]
+    stm.append("po", "older")  # fills the queue; nothing drains it yet
+    threading.Timer(0.05, start_writer).start()
+    stm.append("po", "newer")  # queue full: waits for "older" instead of overtaking it
+    assert stm._client.lists[b"stm:po"] == ["older", "newer"]  # type: ignore[union-attr]
+    assert stm.flush(timeout=1.0)
+
+
+def test_lost_background_batch_is_logged_and_reported() -> None:
+    from structlog.testing import capture_logs
+
+    stm = ShortTermMemory()
+    stm._client = _ListClient()  # type: ignore[assignment]
+    stm._client.fail = True  # type: ignore[union-attr]
+    stm._async_writes = True
+    with capture_logs() as logs:
+        stm.append("po", "dropped")
+        assert not stm.flush(timeout=1.0)
+    assert [e["event"] for e in logs] == ["stm.write_failed"]
+    assert logs[0]["agents"] == ["po"]
+    assert stm.flush(timeout=1.0)  # reported once, then the slate is clean
+
+
+def test_in_memory_history_is_capped() -> None:
+    from memory import short_term
+
+    stm = ShortTermMemory()
+    for i in range(short_term.STM_MAX + 5):
+        stm.append("capped-agent", f"n{i}")
+    assert len(short_term._STORE["capped-agent"]) == short_term.STM_MAX
+    assert stm.history("capped-agent", limit=2) == [
+        f"n{short_term.STM_MAX + 3}",
+        f"n{short_term.STM_MAX + 4}",
+    ]
+
+
+def _fake_redis_module(created: list[str], reachable: list[bool]) -> type:
+    from memory import short_term
+
+    class _FakeRedis:
+        @classmethod
+        def from_url(cls, url: str, **_kwargs: object) -> _FakeRedis:
+            created.append(url)
+            return cls()
+
+        def ping(self) -> bool:
+            if not reachable[0]:
+                raise short_term._RedisError("connection refused")
+            return True
+
+    class _FakeModule:
+        Redis = _FakeRedis
+
+    return _FakeModule
+
+
+def test_redis_client_shared_across_instances(monkeypatch: pytest.MonkeyPatch) -> None:
+    from memory import short_term
+
+    created: list[str] = []
+    monkeypatch.setattr(short_term, "_redis", _fake_redis_module(created, [True]))
+    monkeypatch.setattr(short_term, "_REDIS_CLIENTS", {})
+    monkeypatch.setenv("REDIS_URL", "redis://fake:6379/0")
+    first, second = ShortTermMemory(), ShortTermMemory()
+    assert first._client is second._client and created == ["redis://fake:6379/0"]
+
+
+def test_redis_client_retries_after_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    from memory import short_term
+
+    created: list[str] = []
+    reachable = [False]
+    clock = [100.0]
+    monkeypatch.setattr(short_term, "_redis", _fake_redis_module(created, reachable))
+    monkeypatch.setattr(short_term, "_REDIS_CLIENTS", {})
+    monkeypatch.setattr(short_term, "_REDIS_FAILED_AT", {})
+    monkeypatch.setattr(short_term.time, "monotonic", lambda: clock[0])
+    url = "redis://down:6379/0"
+    assert short_term._redis_client(url) is None
+    reachable[0] = True
+    assert short_term._redis_client(url) is None  # still backing off: no new attempt
+    assert len(created) == 1
+    clock[0] += short_term._REDIS_RETRY_S
+    assert short_term._redis_client(url) is not None
+    assert len(created) == 2
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import json
+import logging
+from collections.abc import Iterator
 from typing import Any
 
 import pytest
@@ -8,7 +11,7 @@ from agents_core.llm import EchoLLM, OllamaLLM, detect_llm
 from agents_core.product_owner import ProductOwnerAgent
 from memory.schemas import MemoryRecord
 from orchestrator.tasks import run_retro
-from tools.search import web_search
+from tools.search import web_search, web_search_batch
 from tools.web import fetch_url
 
 
@@ -26,6 +29,7 @@ def test_ollama_generate_success(monkeypatch: pytest.MonkeyPatch) -> None:
         def __init__(self) -> None:
             self._json = {"response": " hi there  "}
             self.headers = {"content-type": "application/json"}
+            self.content = b'{"response": " hi there  "}'
 
         def raise_for_status(self) -> None:  # noqa: D401 - stub
             return None
@@ -33,17 +37,51 @@ def test_ollama_generate_success(monkeypatch: pytest.MonkeyPatch) -> None:
         def json(self) -> dict[str, Any]:
             return self._json
 
-    def _post(url: str, json: dict[str, Any], timeout: int) -> Any:  # noqa: A002 - param name
-        return _Resp()
+    class _Session:
+        def post(self, url: str, data: bytes, headers: dict[str, str], timeout: int) -> Any:
+            assert url == "http://localhost:11434/api/generate"
+            assert headers["Content-Type"] == "application/json"
+            return _Resp()
 
-    import requests as _requests
+    import agents_core.llm as _llm
 
-    monkeypatch.setattr(_requests, "post", _post, raising=True)
+    monkeypatch.setattr(_llm, "_http_session", _Session, raising=True)
+    _llm.clear_response_cache()
     llm = OllamaLLM(host="http://localhost:11434", model="llama3.1:8b")
     out = llm.generate("hello")
     assert out == "hi there"
 
 
+def test_ollama_responses_are_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    import agents_core.llm as _llm
+
+    calls: list[str] = []
+
+    class _Resp:
+        def raise_for_status(self) -> None:  # noqa: D401 - stub
+            return None
+
+        @property
+        def content(self) -> bytes:
+            return json.dumps({"response": f"answer {len(calls)}"}).encode()
+
+    class _Session:
+        def post(self, url: str, data: bytes, headers: dict[str, str], timeout: int) -> Any:
+            calls.append(json.loads(data)["prompt"])
+            return _Resp()
+
+    monkeypatch.setattr(_llm, "_http_session", _Session, raising=True)
+    _llm.clear_response_cache()
+    llm = OllamaLLM(host="http://localhost:11434", model="cache-test")
+    # Off by default: sampled answers are not replayed
+    assert llm.generate("same prompt") == "answer 1"
+    assert llm.generate("same prompt") == "answer 2"
+
+    monkeypatch.setenv("ENABLE_LLM_CACHE", "1")
+    assert llm.generate("other prompt") == llm.generate("other prompt") == "answer 3"
+    assert calls == ["same prompt", "same prompt", "other prompt"]
+
+
 def test_product_owner_parses_llm_bullets(monkeypatch: pytest.MonkeyPatch) -> None:
     class _MockLLM:
         def generate(self, prompt: str) -> str:  # noqa: D401 - stub
@@ -54,46 +92,248 @@ def test_product_owner_parses_llm_bullets(monkeypatch: pytest.MonkeyPatch) -> No
     assert tasks == ["Task A", "Task B", "Task C"]
 
 
+def test_product_owner_bullet_variants() -> None:
+    class _MockLLM:
+        def generate(self, prompt: str) -> str:  # noqa: D401 - stub
+            return "Intro line\r\n  * Star item  \r\n- \n2) Numbered\n\\- Escaped\n• Dot"
+
+    po = ProductOwnerAgent(name="po", role="Product Owner", memory=None, llm=_MockLLM())
+    assert po.plan_work("x") == ["Star item", "Numbered", "Escaped", "Dot"]
+
+
+def test_product_owner_async_plans_many_concurrently() -> None:
+    import asyncio
+
+    class _AsyncLLM:
+        async def agenerate(self, prompt: str) -> str:  # noqa: D401 - stub
+            await asyncio.sleep(0)
+            return "- Write docs" if "docs" in prompt else "1) Ship it"
+
+    po = ProductOwnerAgent(name="po", role="Product Owner", memory=None, llm=_AsyncLLM())
+    plans = asyncio.run(po.aplan_many(["Improve docs", "Release"]))
+    assert plans == [["Write docs"], ["Ship it"]]
+
+
+def test_plan_work_debug_without_provider_skips_prompt(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("ENABLE_LLM", "0")
+    po = ProductOwnerAgent(name="po", role="Product Owner", memory=None)
+    tasks, debug = po.plan_work_debug("Release")
+    assert debug["provider"] is None and debug["prompt"] is None
+    assert debug["used_fallback"] is True and len(tasks) == 2
+
+
+def test_plan_many_uses_native_batch() -> None:
+    class _BatchLLM:
+        def __init__(self) -> None:
+            self.batches: list[list[str]] = []
+
+        def generate(self, prompt: str) -> str:  # pragma: no cover - batch path is used
+            raise AssertionError("expected a batched call")
+
+        def batch_generate(self, prompts: list[str]) -> list[str]:
+            self.batches.append(prompts)
+            return ["- Write docs", "no bullets here"]
+
+    llm = _BatchLLM()
+    po = ProductOwnerAgent(name="po", role="Product Owner", memory=None, llm=llm)
+    plans = po.plan_many(["Improve docs", "Release"])
+    assert len(llm.batches) == 1 and len(llm.batches[0]) == 2
+    assert plans[0] == ["Write docs"]
+    assert plans[1][0].endswith("Release")  # deterministic fallback
+
+
 def test_web_search_stub() -> None:
     results = web_search("test", k=3)
     assert isinstance(results, list) and results and "test" in results[0]
 
 
-def test_fetch_url_parses_html(monkeypatch: pytest.MonkeyPatch) -> None:
-    class _Resp:
-        status_code = 200
-        headers = {"content-type": "text/html; charset=utf-8"}
-        text = (
-            "<html><head><style>.x{}</style><script>1+1</script></head>"
-            "<body><h1>Title</h1><p>Hello</p></body></html>"
-        )
+def test_web_search_batch_keeps_query_order() -> None:
+    results = web_search_batch(["alpha", "beta"], k=2)
+    assert len(results) == 2
+    assert "alpha" in results[0][0] and "beta" in results[1][0]
+    assert web_search("alpha", k=2) == results[0]
 
-        def raise_for_status(self) -> None:  # noqa: D401 - stub
-            return None
 
-    import requests as _requests
+class _FakeHTTPResponse:
+    """Streamed ``requests.Response`` stand-in for fetch_url tests."""
+
+    def __init__(self, text: str, headers: dict[str, str], status_code: int = 200) -> None:
+        self.status_code, self.headers = status_code, headers
+        self.encoding = "utf-8"
+        self._body = text.encode()
 
-    monkeypatch.setattr(_requests, "get", lambda url, timeout=20: _Resp(), raising=True)
+    def __enter__(self) -> _FakeHTTPResponse:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        return None
+
+    def raise_for_status(self) -> None:
+        return None
+
+    def iter_content(self, chunk_size: int = 1) -> Iterator[bytes]:
+        for start in range(0, len(self._body), chunk_size):
+            yield self._body[start : start + chunk_size]
+
+
+def test_fetch_url_parses_html(monkeypatch: pytest.MonkeyPatch) -> None:
+    from tools import web
+
+    html = (
+        "<html><head><style>.x{}</style><script>1+1</script></head>"
+        "<body><h1>Title</h1><p>Hello</p></body></html>"
+    )
+    resp = _FakeHTTPResponse(html, {"content-type": "text/html; charset=utf-8"})
+    monkeypatch.setattr(web._SESSION, "get", lambda url, **_kwargs: resp, raising=True)
     text = fetch_url("http://example.com")
     assert "Title" in text and "Hello" in text and "1+1" not in text
 
 
 def test_fetch_url_plain_text(monkeypatch: pytest.MonkeyPatch) -> None:
-    class _Resp:
-        status_code = 200
-        headers = {"content-type": "text/plain"}
-        text = "plain content"
-
-        def raise_for_status(self) -> None:  # noqa: D401 - stub
-            return None
-
-    import requests as _requests
+    from tools import web
 
-    monkeypatch.setattr(_requests, "get", lambda url, timeout=20: _Resp(), raising=True)
+    resp = _FakeHTTPResponse("plain content", {"content-type": "text/plain"})
+    monkeypatch.setattr(web._SESSION, "get", lambda url, **_kwargs: resp, raising=True)
     text = fetch_url("http://example.com")
     assert text == "plain content"
 
 
+def test_fetch_url_unknown_charset_falls_back_to_utf8(monkeypatch: pytest.MonkeyPatch) -> None:
+    from tools import web
+
+    resp = _FakeHTTPResponse("caf\u00e9", {"content-type": "text/plain; charset=bogus"})
+    resp.encoding = "bogus"
+    monkeypatch.setattr(web._SESSION, "get", lambda url, **_kwargs: resp)
+    assert fetch_url("http://example.com/bogus") == "caf\u00e9"
+
+
+def test_fetch_url_stops_reading_at_max_bytes(monkeypatch: pytest.MonkeyPatch) -> None:
+    from tools import web
+
+    resp = _FakeHTTPResponse("x" * 300_000, {"content-type": "text/plain"})
+    monkeypatch.setattr(web._SESSION, "get", lambda url, **_kwargs: resp)
+    assert fetch_url("http://example.com/big", max_bytes=100_000) == "x" * 100_000
+
+
+def test_html_to_text_parsers_agree(monkeypatch: pytest.MonkeyPatch) -> None:
+    from tools import web
+
+    html = (
+        "<html><head><title>T</title><script>x()</script></head>"
+        '<body><p>Hello <b>bold</b>  world</p><STYLE type="text/css">p{}</STYLE>'
+        "<noscript>Enable JS</noscript></body></html>"
+    )
+    fast = web._html_to_text(html)
+    monkeypatch.setattr(web, "_HTMLParser", None)
+    assert fast == web._html_to_text(html) == "T Hello bold world"
+
+
+def test_text_extractor_matches_beautifulsoup() -> None:
+    from bs4 import BeautifulSoup
+
+    from tools import web
+
+    html = (
+        "<!DOCTYPE html><html><head><title>Docs &amp; FAQ</title>"
+        "<style>p { color: red }</style></head><body><!-- nav -->"
+        "<h1>Intro</h1>\n  <p>Tea &lt;hot&gt; <a href='#'>link</a>,\tcoffee</p>"
+        "<script>if (a < b) { x() }</script><ul><li>one</li> <li>two</li></ul></body></html>"
+    )
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["script", "style"]):
+        tag.decompose()
+    extractor = web._TextExtractor()
+    extractor.feed(html)
+    assert extractor.finish() == soup.get_text(separator=" ", strip=True)
+
+
+def test_fetch_url_streams_html_without_selectolax(monkeypatch: pytest.MonkeyPatch) -> None:
+    from tools import web
+
+    html = "<html><body><p>Stre&eacute;med</p><script>skip()</script><p>text</p></body></html>"
+    resp = _FakeHTTPResponse(html, {"content-type": "text/html"})
+    monkeypatch.setattr(web, "_HTMLParser", None)
+    monkeypatch.setattr(web, "_CHUNK_BYTES", 5)  # split tags and entities across chunks
+    monkeypatch.setattr(web._SESSION, "get", lambda url, **_kwargs: resp)
+    assert fetch_url("http://example.com/stream") == "Streémed text"
+    assert fetch_url("http://example.com/stream", max_bytes=19) == "Stre"
+
+
+def test_streamed_fetch_unknown_charset_falls_back_to_utf8(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from tools import web
+
+    resp = _FakeHTTPResponse("<p>caf\u00e9</p>", {"content-type": "text/html; charset=bogus"})
+    resp.encoding = "bogus"
+    monkeypatch.setattr(web, "_HTMLParser", None)
+    monkeypatch.setattr(web._SESSION, "get", lambda url, **_kwargs: resp)
+    assert fetch_url("http://example.com/bogus-stream") == "caf\u00e9"
+
+
+def test_fetch_url_revalidates_with_etag(monkeypatch: pytest.MonkeyPatch) -> None:
+    from tools import web
+
+    sent: list[dict[str, str] | None] = []
+
+    def fake_get(url: str, headers: dict[str, str] | None = None, **_kwargs: object) -> object:
+        sent.append(headers)
+        validators = {"content-type": "text/html", "etag": '"v1"'}
+        if headers:
+            return _FakeHTTPResponse("", validators, status_code=304)
+        return _FakeHTTPResponse("<p>Cached page</p>", validators)
+
+    web._RESPONSE_CACHE.clear()
+    monkeypatch.setattr(web._SESSION, "get", fake_get)
+    monkeypatch.setattr(
+        web, "_html_to_text", lambda html: html.replace("<p>", "").replace("</p>", "")
+    )
+    assert web.fetch_url("http://example.com/page") == "Cached page"
+    assert web.fetch_url("http://example.com/page") == "Cached page"
+    assert sent == [None, {"If-None-Match": '"v1"'}]
+
+
+def test_fetch_urls_runs_concurrently_in_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    import httpx
+
+    from tools import web
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/broken":
+            return httpx.Response(500)
+        if request.url.path == "/page":
+            return httpx.Response(200, html="<p>Async</p><script>x()</script>")
+        return httpx.Response(200, text="plain")
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(web, "_new_async_client", lambda: client)
+    urls = ["http://example.com/page", "http://example.com/broken", "http://example.com/txt"]
+    assert web.fetch_urls_sync(urls) == ["Async", "", "plain"]
+    assert client.is_closed  # the blocking wrapper does not leak its loop's client
+
+
+def test_fetch_urls_client_is_pooled_per_loop() -> None:
+    import asyncio
+
+    from tools import web
+
+    async def _clients() -> tuple[object, object]:
+        return web._async_http_client(), web._async_http_client()
+
+    first, second = asyncio.run(_clients())
+    assert first is second
+
+
+def test_fetch_url_session_pools_connections() -> None:
+    from tools import web
+
+    adapter = web._SESSION.get_adapter("https://example.com")
+    assert adapter is web._SESSION.get_adapter("http://example.com")
+    assert adapter.max_retries.total == 2
+    assert web._SESSION.headers["User-Agent"].startswith("aiteam/")
+    assert "gzip" in web._SESSION.headers["Accept-Encoding"]
+
+
 def test_wsgi_import_executes_settings(monkeypatch: pytest.MonkeyPatch) -> None:
     # Ensure DJANGO_SETTINGS_MODULE is set for import side-effects
     monkeypatch.setenv("DJANGO_SETTINGS_MODULE", "aiteam.settings")
@@ -107,6 +347,52 @@ def test_orchestrator_run_retro_returns_ok() -> None:
     assert run_retro() == "ok"
 
 
+def test_run_retro_writes_both_notes_in_one_call(monkeypatch: pytest.MonkeyPatch) -> None:
+    from orchestrator import tasks
+
+    writes: list[list[tuple[str, str]]] = []
+
+    class _FakeGraph:
+        enabled = True
+
+        def upsert_notes(self, notes: list[tuple[str, str]]) -> None:
+            writes.append(list(notes))
+
+    monkeypatch.setattr(tasks, "get_knowledge_graph", lambda: _FakeGraph())
+    assert run_retro() == "ok"
+    assert len(writes) == 1
+    retro, insights = writes[0]
+    assert retro[1].startswith("retro: ")
+    assert json.loads(insights[1].removeprefix("retro_insights: "))["summaries"]
+
+
+def test_run_retro_skips_serialization_without_neo4j(monkeypatch: pytest.MonkeyPatch) -> None:
+    from orchestrator import tasks
+
+    def _fail(*_args: object, **_kwargs: object) -> str:
+        raise AssertionError("insights serialized without a knowledge graph")
+
+    monkeypatch.setattr(tasks, "json_dumps", _fail)
+    assert not tasks.get_knowledge_graph().enabled
+    assert run_retro() == "ok"
+
+
+def test_run_retro_skips_insights_when_unused(monkeypatch: pytest.MonkeyPatch) -> None:
+    import structlog
+
+    from orchestrator import tasks
+
+    def _fail(*_args: object, **_kwargs: object) -> dict[str, object]:
+        raise AssertionError("insights derived although nothing consumes them")
+
+    quiet = structlog.wrap_logger(
+        None, wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+    monkeypatch.setattr(tasks, "logger", quiet)
+    monkeypatch.setattr(tasks, "_retro_insights", _fail)
+    assert run_retro() == "ok"
+
+
 def test_memory_record_schema() -> None:
     rec = MemoryRecord(agent="po", content="foo")
     assert rec.agent == "po" and rec.content == "foo"
@@ -122,8 +408,25 @@ def test_short_term_memory_with_fake_client(monkeypatch: pytest.MonkeyPatch) ->
         def ping(self) -> None:  # noqa: D401 - stub
             return None
 
-        def rpush(self, key: str, value: str) -> None:
-            self.store.setdefault(key, []).append(value)
+        def rpush(self, key: str, *values: str) -> None:
+            self.store.setdefault(key, []).extend(values)
+
+        def ltrim(self, key: str, start: int, end: int) -> None:
+            data = self.store.get(key, [])
+            self.store[key] = data[start:] if end == -1 else data[start : end + 1]
+
+        def pipeline(self, transaction: bool = True) -> _FakeClient:
+            return self  # commands apply immediately; execute() is a no-op
+
+        def execute(self) -> None:
+            return None
+
+        def llen(self, key: str) -> int:
+            return len(self.store.get(key, []))
+
+        def lindex(self, key: str, index: int) -> str | None:
+            data = self.store.get(key, [])
+            return data[index] if -len(data) <= index < len(data) else None
 
         def lrange(self, key: str, start: int, end: int) -> list[str]:
             data = self.store.get(key, [])
@@ -147,3 +450,142 @@ def test_short_term_memory_with_fake_client(monkeypatch: pytest.MonkeyPatch) ->
     stm.append("po", "x")
     hist = stm.history("po", limit=1)
     assert hist == ["x"]
+    # Lists are trimmed server-side to the newest STM_MAX items
+    monkeypatch.setattr("memory.short_term.STM_MAX", 2)
+    stm.append_many("po", ["y", "z"])
+    assert stm.history("po", limit=5) == ["y", "z"]
+    assert stm.last("po") == "z" and stm.last("ac") == ""
+    assert stm.count("po") == 2 and stm.count("po", 1) == 1 and stm.count("ac") == 0
+
+
+def test_concurrent_identical_prompts_share_one_call(monkeypatch: pytest.MonkeyPatch) -> None:
+    import asyncio
+    import threading
+    import time
+
+    import agents_core.llm as _llm
+
+    class _SlowLLM:
+        model = "single-flight"
+
+        def __init__(self) -> None:
+            self.calls = 0
+
+        @_llm._response_cached
+        def generate(self, prompt: str) -> str:
+            self.calls += 1
+            time.sleep(0.1)
+            return f"answer to {prompt}"
+
+        @_llm._aresponse_cached
+        async def agenerate(self, prompt: str) -> str:
+            self.calls += 1
+            await asyncio.sleep(0.05)
+            return f"async answer to {prompt}"
+
+    monkeypatch.setenv("ENABLE_LLM_CACHE", "1")
+    _llm.clear_response_cache()
+    llm = _SlowLLM()
+    results: list[str] = []
+    threads = [
+        threading.Thread(target=lambda: results.append(llm.generate("same"))) for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ["answer to same"] * 4
+    assert llm.calls == 1
+
+    async def _burst() -> list[str]:
+        return list(await asyncio.gather(*(llm.agenerate("again") for _ in range(4))))
+
+    assert asyncio.run(_burst()) == ["async answer to again"] * 4
+    assert llm.calls == 2
+
+
+def test_product_owner_streams_tasks_across_chunk_boundaries() -> None:
+    import asyncio
+
+    class _StreamingLLM:
+        def stream(self, prompt: str) -> Any:
+            yield from ["Sure:\n- Fir", "st task\n2) Sec", "ond task"]
+
+    po = ProductOwnerAgent(name="po", role="Product Owner", memory=None, llm=_StreamingLLM())
+
+    async def _collect() -> list[str]:
+        return [task async for task in po.stream_tasks("x")]
+
+    assert asyncio.run(_collect()) == ["First task", "Second task"]
+
+
+def test_async_planning_writes_memory_off_the_event_loop() -> None:
+    import asyncio
+    import threading
+
+    class _RecordingMemory:
+        def __init__(self) -> None:
+            self.threads: list[threading.Thread] = []
+
+        def append(self, agent: str, item: str) -> None:
+            self.threads.append(threading.current_thread())
+
+    memory = _RecordingMemory()
+    po = ProductOwnerAgent(name="po", role="Product Owner", memory=memory, llm=None)
+
+    async def _plan() -> threading.Thread:
+        await po.aplan_work("Ship the release")
+        _ = [task async for task in po.stream_tasks("Ship the release")]
+        return threading.current_thread()
+
+    loop_thread = asyncio.run(_plan())
+    assert len(memory.threads) == 2 and loop_thread not in memory.threads
+
+
+def test_transformers_model_kwargs_match_hardware(monkeypatch: pytest.MonkeyPatch) -> None:
+    import importlib.util
+    from types import SimpleNamespace
+
+    import agents_core.llm as _llm
+
+    def _torch(cuda: bool, bf16: bool) -> SimpleNamespace:
+        return SimpleNamespace(
+            bfloat16="bf16",
+            cuda=SimpleNamespace(is_available=lambda: cuda, is_bf16_supported=lambda: bf16),
+        )
+
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name: None)
+    assert _llm._transformers_model_kwargs(_torch(cuda=False, bf16=False)) == {}
+    assert _llm._transformers_model_kwargs(_torch(cuda=True, bf16=False)) == {}
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name: object())
+    assert _llm._transformers_model_kwargs(_torch(cuda=True, bf16=True)) == {
+        "device_map": "auto",
+        "torch_dtype": "bf16",
+    }
+
+
+def test_cancelled_async_leader_does_not_cancel_followers() -> None:
+    import asyncio
+
+    import agents_core.llm as _llm
+
+    calls: list[int] = []
+
+    async def _upstream() -> str:
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "shared answer"
+
+    async def _scenario() -> str:
+        leader = asyncio.ensure_future(_llm._asingle_flight("cancel-me", _upstream))
+        await asyncio.sleep(0)  # the leader starts the upstream call
+        follower = asyncio.ensure_future(_llm._asingle_flight("cancel-me", _upstream))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(_scenario()) == "shared answer"
+    assert calls == [1]
+    assert not _llm._AINFLIGHT
@@ -3,14 +3,14 @@ from __future__ import annotations
 import json
 from typing import Any
 
+import pytest
 from django.test import Client
 
-from agents_core.dynamic_expert import select_experts_from_tasks
+from agents_core.dynamic_expert import select_experts_from_tasks, select_experts_from_tasks_batch
 
 
-def test_experts_run_non_it_domains() -> None:
+def test_experts_run_non_it_domains(client: Client) -> None:
     """API should return non-IT experts when description contains domain cues."""
-    client = Client()
     # Contains cues for legal (gdpr), finance (budget), hr (onboarding)
     payload = {
         "description": (
@@ -47,3 +47,159 @@ def test_llm_unknown_role_preserved(monkeypatch: Any) -> None:
     assert "market research analyst" in names
     # debug should reflect provider
     assert dbg["llm"]["provider"] in {"FakeLLM", None}  # type: ignore[index]
+
+
+def test_selection_is_memoized_per_provider() -> None:
+    """Repeated selections for the same tasks and provider should not re-query the LLM."""
+
+    class CountingLLM:
+        model = "counting"
+
+        def __init__(self) -> None:
+            self.calls = 0
+
+        def generate(self, prompt: str) -> str:  # noqa: D401
+            self.calls += 1
+            return "- Contract Negotiator"
+
+    llm = CountingLLM()
+    tasks = ["Prepare the supplier negotiation playbook"]
+    first, _ = select_experts_from_tasks(tasks, llm=llm)
+    second, _ = select_experts_from_tasks(tasks, llm=llm)
+    assert llm.calls == 1
+    assert [s.expertise for s in first] == [s.expertise for s in second]
+
+
+def test_unkeyable_provider_selection_is_not_memoized() -> None:
+    """Providers without model/host settings have no stable key, so nothing is cached."""
+
+    class AnonymousLLM:
+        def __init__(self) -> None:
+            self.calls = 0
+
+        def generate(self, prompt: str) -> str:  # noqa: D401
+            self.calls += 1
+            return "- Tax Advisor"
+
+    llm = AnonymousLLM()
+    tasks = ["File the quarterly VAT return"]
+    select_experts_from_tasks(tasks, llm=llm)
+    select_experts_from_tasks(tasks, llm=llm)
+    assert llm.calls == 2
+
+
+def test_memoized_selection_debug_is_isolated() -> None:
+    """Mutating a returned debug dict must not leak into later cache hits."""
+    tasks = ["Write unit tests for the parser"]
+    _, first = select_experts_from_tasks(tasks)
+    first["heuristic"].append("tampered")  # type: ignore[attr-defined]
+    _, second = select_experts_from_tasks(tasks)
+    assert "tampered" not in second["heuristic"]  # type: ignore[operator]
+
+
+def test_batch_selection_matches_single_calls() -> None:
+    """Batch selection returns one result per task list, in input order."""
+
+    class EchoRolesLLM:
+        model = "batch"
+
+        def generate(self, prompt: str) -> str:  # noqa: D401
+            return "- Tax Advisor" if "invoice" in prompt else "- Tour Guide"
+
+    llm = EchoRolesLLM()
+    results = select_experts_from_tasks_batch(
+        [["Audit the invoice archive"], ["Plan the city walk"]], llm=llm
+    )
+    assert len(results) == 2
+    assert "tax advisor" in {s.expertise for s in results[0][0]}
+    assert "tour guide" in {s.expertise for s in results[1][0]}
+
+
+def test_detected_llm_skipped_when_heuristics_saturate(monkeypatch: Any) -> None:
+    """Rich heuristic coverage should avoid an auto-detected LLM round-trip."""
+
+    class FailingLLM:
+        def generate(self, prompt: str) -> str:  # noqa: D401
+            raise AssertionError("LLM must not be called")
+
+    import agents_core.dynamic_expert as de
+
+    monkeypatch.setattr(de, "detect_llm", lambda: FailingLLM())
+    specs, dbg = select_experts_from_tasks(
+        ["Build the React frontend, Django REST backend and Postgres schema with pytest coverage"]
+    )
+    assert {"frontend", "backend", "database", "qa"} <= {s.expertise for s in specs}
+    assert dbg["llm"]["skipped"] is True  # type: ignore[index]
+
+
+def test_explicit_llm_not_served_a_skipped_detected_selection(monkeypatch: Any) -> None:
+    """An auto-detected, heuristic-only result must not stand in for an explicit LLM."""
+
+    class KeyedLLM:
+        def __init__(self) -> None:
+            self.model, self.host, self.calls = "m", "http://h", 0
+
+        def generate(self, prompt: str) -> str:  # noqa: D401
+            self.calls += 1
+            return "- Security Auditor"
+
+    import agents_core.dynamic_expert as de
+
+    detected, explicit = KeyedLLM(), KeyedLLM()
+    monkeypatch.setattr(de, "detect_llm", lambda: detected)
+    tasks = ["Ship the React frontend, Django REST backend and Postgres schema with pytest"]
+    _, auto_dbg = select_experts_from_tasks(tasks)
+    assert auto_dbg["llm"]["skipped"] is True  # type: ignore[index]
+    for select in (
+        lambda: select_experts_from_tasks(tasks, llm=explicit),
+        lambda: select_experts_from_tasks_batch([tasks], llm=explicit)[0],
+    ):
+        _, dbg = select()
+        assert not dbg["llm"].get("skipped")  # type: ignore[union-attr]
+    assert detected.calls == 0 and explicit.calls == 1
+
+
+def test_detected_llm_skipped_when_every_task_matches(monkeypatch: Any) -> None:
+    """When each task maps to a category, the auto-detected LLM is not needed."""
+
+    class FailingLLM:
+        def generate(self, prompt: str) -> str:  # noqa: D401
+            raise AssertionError("LLM must not be called")
+
+    import agents_core.dynamic_expert as de
+
+    monkeypatch.setattr(de, "detect_llm", lambda: FailingLLM())
+    specs, dbg = select_experts_from_tasks(["Polish the React UI", "Add pytest coverage"])
+    assert {"frontend", "qa"} <= {s.expertise for s in specs}
+    assert dbg["llm"]["skipped"] is True  # type: ignore[index]
+
+
+def test_bulk_selection_matches_heuristics_without_llm() -> None:
+    """Bulk selection should be heuristic-only and fall back to a generalist."""
+    from agents_core.dynamic_expert import select_experts_bulk
+
+    results = select_experts_bulk([["Set up Docker and the Django API"], ["Water the plants"]])
+    assert [s.expertise for s in results[0]] == ["backend", "devops"]
+    assert [(s.expertise, s.source) for s in results[1]] == [("generalist", "fallback")]
+
+
+def test_keyword_automaton_matches_substring_fallback(monkeypatch: Any) -> None:
+    import agents_core.dynamic_expert as de
+
+    if de._KEYWORD_AUTOMATON is None:  # pragma: no cover - pyahocorasick not installed
+        pytest.skip("pyahocorasick not installed")
+    texts = [
+        "Draft a GDPR-compliant data processing agreement and the Q3 marketing budget",
+        "Update the onboarding policy for new hires",
+        "Set up Docker, the Django API and pytest coverage",
+        "Water the plants",
+    ]
+    de._heuristic_categories.cache_clear()
+    fast = [de._heuristic_categories(t) for t in texts]
+    monkeypatch.setattr(de, "_KEYWORD_AUTOMATON", None)
+    de._heuristic_categories.cache_clear()
+    try:
+        assert [de._heuristic_categories(t) for t in texts] == fast
+    finally:
+        de._heuristic_categories.cache_clear()
+    assert {"legal", "finance"} <= set(fast[0]) and not fast[3]
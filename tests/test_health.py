@@ -3,8 +3,16 @@ from __future__ import annotations
 from django.test import Client
 
 
-def test_health_endpoint() -> None:
-    client = Client()
+def test_health_endpoint(client: Client) -> None:
     resp = client.get("/api/health")
     assert resp.status_code == 200
     assert resp.json()["status"] == "ok"
+
+
+def test_version_endpoint(client: Client) -> None:
+    from aiteam import __version__
+
+    resp = client.get("/api/version")
+    assert resp.status_code == 200
+    assert resp["Content-Type"] == "application/json"
+    assert resp.json() == {"version": str(__version__)}
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import pytest
+
+from memory import long_term
+
+
+def test_enqueue_note_is_noop_without_neo4j() -> None:
+    assert not long_term.get_knowledge_graph().enabled
+    long_term.enqueue_note("ac", "feedback: ignored")
+    assert long_term.flush_notes(timeout=0.5)
+
+
+def test_enqueued_notes_are_written_in_batches(monkeypatch: pytest.MonkeyPatch) -> None:
+    written: list[list[tuple[str, str]]] = []
+
+    class _FakeGraph:
+        enabled = True
+
+        def upsert_notes(self, notes: list[tuple[str, str]]) -> None:
+            written.append(list(notes))
+
+    monkeypatch.setattr(long_term, "get_knowledge_graph", lambda: _FakeGraph())
+    long_term.enqueue_note("ac", "feedback: one")
+    long_term.enqueue_note("po", "planned 2 task(s)")
+    assert long_term.flush_notes(timeout=2.0)
+    flat = [note for batch in written for note in batch]
+    assert flat == [("ac", "feedback: one"), ("po", "planned 2 task(s)")]
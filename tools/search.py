@@ -1,8 +1,24 @@
-"""Search utilities stubs used by agents (to be implemented)."""
+"""Search utilities stubs used by agents (to be implemented).
+
+``web_search_batch()`` is the primary entry point so a provider implementation
+can answer many queries in one concurrent fan-out (or a bulk endpoint) instead
+of one sequential round-trip per query; ``web_search()`` wraps it for a single
+query.
+"""
 
 from __future__ import annotations
 
+from collections.abc import Sequence
+
+
+def web_search_batch(queries: Sequence[str], k: int = 5) -> list[list[str]]:
+    """Search the web for several queries at once using Tavily/SerpAPI (to be implemented).
+
+    Returns one result list per query, in input order.
+    """
+    return [[f"Result stub for: {query} (top {k})"] for query in queries]
+
 
-def web_search(query: str, k: int = 5) -> list[str]:  # pragma: no cover - stub
-    """Search the web using Tavily/SerpAPI (to be implemented)."""
-    return [f"Result stub for: {query} (top {k})"]
+def web_search(query: str, k: int = 5) -> list[str]:
+    """Search the web for a single query (see ``web_search_batch()``)."""
+    return web_search_batch([query], k)[0]
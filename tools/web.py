@@ -1,19 +1,291 @@
-"""Lightweight web utility functions (fetch + parse HTML to text)."""
+"""Lightweight web utility functions (fetch + parse HTML to text).
+
+Requests go through one module-level ``requests.Session`` so repeated fetches
+to the same host reuse pooled keep-alive connections instead of paying a new
+TCP/TLS handshake per URL. HTML is parsed with selectolax's C-based lexbor
+parser when installed. Without it, the stdlib ``html.parser`` tokenizer is fed
+the body chunk by chunk as it streams in and emits visible text directly, with
+no intermediate tree.
+Responses carrying an ``ETag`` or ``Last-Modified`` validator are remembered, and
+later fetches of the same URL send a conditional GET; a ``304 Not Modified``
+returns the previously extracted text without downloading or parsing again.
+Bodies are streamed and capped (2 MB by default) so memory stays bounded.
+``fetch_urls()`` fetches many URLs concurrently over a pooled
+``httpx.AsyncClient``.
+"""
 
 from __future__ import annotations
 
+import asyncio
+import codecs
+import os
+import re
+import weakref
+from collections.abc import Mapping, Sequence
+from html.parser import HTMLParser
+
+import httpx
 import requests
-from bs4 import BeautifulSoup
-
-
-def fetch_url(url: str, timeout: int = 20) -> str:
-    """Fetch a URL and return visible text content (best-effort)."""
-    resp = requests.get(url, timeout=timeout)
-    resp.raise_for_status()
-    content_type: str | None = resp.headers.get("content-type")
-    if content_type and "html" in content_type:
-        soup = BeautifulSoup(resp.text, "html.parser")
-        for tag in soup(["script", "style"]):
-            tag.decompose()
-        return soup.get_text(separator=" ", strip=True)
-    return resp.text
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from agents_core.cache import LRUCache
+
+try:  # Optional C-based HTML parser (lexbor); much faster than html.parser
+    from selectolax.lexbor import LexborHTMLParser as _HTMLParser  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency fallback
+    _HTMLParser = None  # type: ignore
+
+
+_USER_AGENT = f"aiteam/{os.getenv('AITEAM_VERSION', '0.1.0')}"
+
+
+def _build_session() -> requests.Session:
+    """Create the shared session with pooled adapters and retries on connection errors."""
+    session = requests.Session()
+    # requests already advertises every encoding urllib3 can decode (gzip/deflate, plus br
+    # and zstd when their decoders are installed); only the User-Agent is set here
+    session.headers["User-Agent"] = _USER_AGENT
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(total=2, backoff_factor=0.2),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_SESSION = _build_session()
+
+# Invisible blocks are cut from the markup in one regex pass before lexbor builds its
+# tree, so their nodes never have to be found and decomposed
+_INVISIBLE_BLOCK_RE = re.compile(
+    r"<(script|style|noscript)\b[^>]*>.*?</\1\s*>", re.DOTALL | re.IGNORECASE
+)
+
+# Streamed bodies are read in 64 KiB chunks and cut off after 2 MB
+_CHUNK_BYTES = 64 * 1024
+_MAX_BODY_BYTES = 2_000_000
+
+# url -> (etag, last_modified, extracted text), for conditional re-fetches
+_RESPONSE_CACHE: LRUCache[str, tuple[str, str, str]] = LRUCache(maxsize=256)
+
+# One pooled httpx.AsyncClient per event loop (connections are bound to their loop)
+_ASYNC_CLIENTS: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def fetch_url(url: str, timeout: int = 20, *, max_bytes: int = _MAX_BODY_BYTES) -> str:
+    """Fetch a URL and return visible text content (best-effort).
+
+    The body is streamed and reading stops after ``max_bytes``, so huge pages
+    are truncated rather than buffered whole.
+    """
+    cached, headers = _revalidation(url)
+    with _SESSION.get(url, timeout=timeout, headers=headers or None, stream=True) as resp:
+        if resp.status_code == 304 and cached is not None:
+            return cached
+        resp.raise_for_status()
+        if _HTMLParser is None and _is_html(resp.headers):
+            # Fused fetch + tokenize + extract: chunks go straight to the tokenizer
+            text = _stream_text(resp, max_bytes)
+            _remember_validators(url, resp.headers, text)
+            return text
+        body = _read_capped(resp, max_bytes)
+    return _extract_text(url, body, resp.encoding, resp.headers)
+
+
+async def fetch_urls(
+    urls: Sequence[str], timeout: int = 20, *, max_bytes: int = _MAX_BODY_BYTES
+) -> list[str]:
+    """Fetch several URLs concurrently; results keep input order.
+
+    Like ``fetch_url()`` (same text extraction, cap and revalidation), but all
+    requests share one pooled ``httpx.AsyncClient`` and run at once. Best-effort:
+    a URL that fails yields "" instead of failing the whole batch.
+    """
+    return await _fetch_all(_async_http_client(), urls, timeout, max_bytes)
+
+
+def fetch_urls_sync(
+    urls: Sequence[str], timeout: int = 20, *, max_bytes: int = _MAX_BODY_BYTES
+) -> list[str]:
+    """Blocking wrapper around ``fetch_urls()`` for callers without an event loop.
+
+    Each call runs a fresh event loop, so it uses a client scoped to that loop and
+    closes it afterwards instead of leaving one pooled client behind per call.
+    """
+    return asyncio.run(_fetch_all_with_own_client(urls, timeout, max_bytes))
+
+
+async def _fetch_all_with_own_client(
+    urls: Sequence[str], timeout: int, max_bytes: int
+) -> list[str]:
+    async with _new_async_client() as client:
+        return await _fetch_all(client, urls, timeout, max_bytes)
+
+
+async def _fetch_all(
+    client: httpx.AsyncClient, urls: Sequence[str], timeout: int, max_bytes: int
+) -> list[str]:
+    results = await asyncio.gather(
+        *(_afetch(client, url, timeout, max_bytes) for url in urls), return_exceptions=True
+    )
+    return [result if isinstance(result, str) else "" for result in results]
+
+
+async def _afetch(client: httpx.AsyncClient, url: str, timeout: int, max_bytes: int) -> str:
+    cached, headers = _revalidation(url)
+    async with client.stream("GET", url, timeout=timeout, headers=headers) as resp:
+        if resp.status_code == 304 and cached is not None:
+            return cached
+        resp.raise_for_status()
+        body = bytearray()
+        async for chunk in resp.aiter_bytes(_CHUNK_BYTES):
+            body += chunk
+            if len(body) >= max_bytes:
+                del body[max_bytes:]
+                break
+    return _extract_text(url, body, resp.encoding, resp.headers)
+
+
+def _async_http_client() -> httpx.AsyncClient:
+    """Return the pooled ``httpx.AsyncClient`` of the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(loop)
+    if client is None:
+        client = _ASYNC_CLIENTS[loop] = _new_async_client()
+    return client
+
+
+def _new_async_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        follow_redirects=True,
+        headers={"User-Agent": _USER_AGENT},
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+    )
+
+
+def _revalidation(url: str) -> tuple[str | None, dict[str, str]]:
+    """Return the cached text for ``url`` (if any) and the conditional-GET headers."""
+    cached = _RESPONSE_CACHE.get(url)
+    if cached is None:
+        return None, {}
+    etag, last_modified, text = cached
+    headers: dict[str, str] = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return text, headers
+
+
+def _extract_text(
+    url: str, body: bytes | bytearray, encoding: str | None, headers: Mapping[str, str]
+) -> str:
+    """Decode a fetched body, extract visible text from HTML and remember validators."""
+    raw = body.decode(_codec_name(encoding), errors="replace")
+    text = _html_to_text(raw) if _is_html(headers) else raw
+    _remember_validators(url, headers, text)
+    return text
+
+
+def _codec_name(encoding: str | None) -> str:
+    """Return ``encoding`` if Python knows the codec, else ``"utf-8"``.
+
+    The charset comes from the server, so an unknown label (``charset=bogus``) must
+    not turn into a ``LookupError``.
+    """
+    if encoding:
+        try:
+            return codecs.lookup(encoding).name
+        except LookupError:
+            pass
+    return "utf-8"
+
+
+def _is_html(headers: Mapping[str, str]) -> bool:
+    content_type: str | None = headers.get("content-type")
+    return bool(content_type and "html" in content_type)
+
+
+def _remember_validators(url: str, headers: Mapping[str, str], text: str) -> None:
+    """Cache ``text`` for conditional re-fetches if the response carries validators."""
+    etag = headers.get("etag") or ""
+    last_modified = headers.get("last-modified") or ""
+    if etag or last_modified:
+        _RESPONSE_CACHE.set(url, (etag, last_modified, text))
+
+
+def _read_capped(resp: requests.Response, max_bytes: int) -> bytearray:
+    """Read at most ``max_bytes`` of a streamed body, in ``_CHUNK_BYTES`` chunks."""
+    body = bytearray()
+    for chunk in resp.iter_content(chunk_size=_CHUNK_BYTES):
+        body += chunk
+        if len(body) >= max_bytes:
+            del body[max_bytes:]
+            break
+    return body
+
+
+def _stream_text(resp: requests.Response, max_bytes: int) -> str:
+    """Tokenize a streamed HTML body as it arrives, reading at most ``max_bytes``."""
+    decoder = codecs.getincrementaldecoder(_codec_name(resp.encoding))(errors="replace")
+    extractor = _TextExtractor()
+    remaining = max_bytes
+    for chunk in resp.iter_content(chunk_size=_CHUNK_BYTES):
+        chunk = chunk[:remaining]
+        remaining -= len(chunk)
+        extractor.feed(decoder.decode(chunk))
+        if remaining <= 0:
+            break
+    extractor.feed(decoder.decode(b"", final=True))
+    return extractor.finish()
+
+
+class _TextExtractor(HTMLParser):
+    """Collect stripped text nodes outside script/style/noscript, without building a tree."""
+
+    _INVISIBLE = frozenset({"script", "style", "noscript"})
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self._skip_depth = 0
+        self._pieces: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in self._INVISIBLE:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self._INVISIBLE and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip_depth:
+            piece = data.strip()
+            if piece:
+                self._pieces.append(piece)
+
+    def finish(self) -> str:
+        """Flush buffered input and return the text pieces joined by single spaces."""
+        self.close()
+        return " ".join(self._pieces)
+
+
+def _html_to_text(html: str) -> str:
+    """Return the visible text of ``html`` with scripts, styles and noscripts removed."""
+    if _HTMLParser is not None:
+        html = _INVISIBLE_BLOCK_RE.sub(" ", html)
+        root = _HTMLParser(html).root
+        if root is None:
+            return ""
+        # Whole document (not just <body>), like _TextExtractor; lexbor keeps
+        # whitespace-only nodes as empty pieces, which are dropped
+        pieces = root.text(separator="\x00", strip=True).split("\x00")
+        return " ".join(piece for piece in pieces if piece)
+    extractor = _TextExtractor()
+    extractor.feed(html)
+    return extractor.finish()